@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """Coalesce concurrent single-item requests into batched calls.
+
+    Callers await submit(item). The first queued item opens a collection
+    window of max_wait_ms; everything that arrives before it closes (up to
+    max_batch_size items) is passed to process_batch as one list, and each
+    caller gets back its own entry of the returned list. Batches run as
+    separate tasks, so a slow batch doesn't hold up collecting the next one.
+    """
+
+    def __init__(self, process_batch, max_batch_size: int = 8, max_wait_ms: float = 10):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self._queue = None
+        self._collector = None
+        self._collecting = []  # the batch the collector is still filling
+        self._in_flight = set()
+        self.batch_size_histogram = Counter()
+        self.queue_depth_histogram = Counter()
+        self.items_processed = 0
+
+    def start(self):
+        """Start the collector task on the running event loop"""
+        if self._collector is None or self._collector.done():
+            self._queue = asyncio.Queue()
+            self._collector = asyncio.create_task(self._collect())
+
+    async def stop(self):
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+            self._collector = None
+
+            # Items collected or queued but never dispatched would otherwise
+            # leave their callers waiting forever
+            pending = self._collecting
+            self._collecting = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(RuntimeError("batcher stopped"))
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def submit(self, item):
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self.queue_depth_histogram[self._queue.qsize()] += 1
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._collecting = batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self._collecting = []
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch):
+        # Callers that gave up (e.g. client disconnected) don't need a slot
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if not batch:
+            return
+
+        self.batch_size_histogram[len(batch)] += 1
+        self.items_processed += len(batch)
+        try:
+            results = await self.process_batch([item for item, _ in batch])
+        except Exception as e:
+            logger.error(f"Batch of {len(batch)} failed: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self):
+        batches = sum(self.batch_size_histogram.values())
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "batches_in_flight": len(self._in_flight),
+            "batches": batches,
+            "items": self.items_processed,
+            "mean_batch_size": round(self.items_processed / batches, 2) if batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_size_histogram.items())),
+            "queue_depth_histogram": dict(sorted(self.queue_depth_histogram.items()))
+        }
@@ -0,0 +1,39 @@
+import os
+import json
+import hashlib
+import numpy as np
+
+from .detections import Detections
+from .two_tier_cache import TwoTierCache
+
+class CacheConfig:
+    MEMORY_ENTRIES = int(os.getenv("DETECTION_CACHE_SIZE", 1024))
+    REDIS_TTL = int(os.getenv("DETECTION_CACHE_TTL", 7 * 24 * 3600))
+    REDIS_PREFIX = "detections"
+
+class DetectionCache(TwoTierCache):
+    """Content-addressed cache of detection results.
+
+    Entries are keyed by a hash of the image content and the model name,
+    and stored in Redis as JSON columns.
+    """
+
+    def __init__(self, max_entries: int = CacheConfig.MEMORY_ENTRIES):
+        super().__init__(
+            "Detection cache", max_entries, CacheConfig.REDIS_TTL,
+            encode=lambda detections: json.dumps(detections.to_columns()),
+            decode=lambda value: Detections.from_columns(json.loads(value))
+        )
+
+    @staticmethod
+    def make_key(image, model_name: str) -> str:
+        """Hash decoded pixels (with their shape) or the raw encoded bytes"""
+        digest = hashlib.blake2b(digest_size=16)
+        if isinstance(image, np.ndarray):
+            digest.update(str(image.shape).encode())
+            digest.update(np.ascontiguousarray(image).data)
+        else:
+            digest.update(image.encode() if isinstance(image, str) else image)
+        return f"{CacheConfig.REDIS_PREFIX}:{model_name}:{digest.hexdigest()}"
+
+detection_cache = DetectionCache()
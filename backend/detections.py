@@ -0,0 +1,84 @@
+import numpy as np
+
+class Detections:
+    """Columnar detection results for one image.
+
+    Boxes (N x 4, xyxy), confidences, class ids and labels are kept as
+    NumPy arrays so filtering, picking the largest object and grouping by
+    label stay vectorized. Per-box dicts are only built by to_dicts(), at
+    the JSON boundary.
+    """
+
+    __slots__ = ("boxes", "confidences", "class_ids", "labels")
+
+    def __init__(self, boxes, confidences, class_ids, labels):
+        self.boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        self.confidences = np.asarray(confidences, dtype=np.float32)
+        self.class_ids = np.asarray(class_ids, dtype=np.int32)
+        self.labels = np.asarray(labels, dtype=object)
+
+    @classmethod
+    def empty(cls):
+        return cls(np.empty((0, 4)), [], [], [])
+
+    @classmethod
+    def from_result(cls, result, names):
+        """Build from an ultralytics Results object in one tensor transfer"""
+        boxes = result.boxes
+        class_ids = boxes.cls.cpu().numpy().astype(np.int32)
+        lookup = np.array([names[i] for i in range(len(names))], dtype=object)
+        return cls(boxes.xyxy.cpu().numpy(), boxes.conf.cpu().numpy(), class_ids, lookup[class_ids])
+
+    @classmethod
+    def from_columns(cls, columns):
+        return cls(columns["boxes"], columns["confidences"], columns["class_ids"], columns["labels"])
+
+    def to_columns(self):
+        """Compact JSON-serializable form, used for caching"""
+        return {
+            "boxes": self.boxes.tolist(),
+            "confidences": self.confidences.tolist(),
+            "class_ids": self.class_ids.tolist(),
+            "labels": self.labels.tolist()
+        }
+
+    def __len__(self):
+        return len(self.confidences)
+
+    def _select(self, index):
+        return Detections(self.boxes[index], self.confidences[index],
+                          self.class_ids[index], self.labels[index])
+
+    @property
+    def areas(self):
+        return (self.boxes[:, 2] - self.boxes[:, 0]) * (self.boxes[:, 3] - self.boxes[:, 1])
+
+    def filter(self, min_confidence: float = None, labels=None):
+        """Keep detections above a confidence floor and/or with given labels"""
+        mask = np.ones(len(self), dtype=bool)
+        if min_confidence is not None:
+            mask &= self.confidences >= min_confidence
+        if labels is not None:
+            mask &= np.isin(self.labels, list(labels))
+        return self._select(mask)
+
+    def largest(self):
+        """The detection with the biggest box area, or None if empty"""
+        if not len(self):
+            return None
+        index = int(np.argmax(self.areas))
+        return self._select(slice(index, index + 1))
+
+    def group_by_label(self):
+        """Map each label to the Detections carrying it"""
+        unique, inverse = np.unique(self.labels.astype(str), return_inverse=True)
+        return {label: self._select(inverse == i) for i, label in enumerate(unique)}
+
+    def to_dicts(self):
+        """Per-box dicts in the API's response shape"""
+        boxes = self.boxes.astype(int).tolist()
+        confidences = np.round(self.confidences.astype(float), 2).tolist()
+        return [
+            {"label": label, "box": box, "confidence": confidence}
+            for label, box, confidence in zip(self.labels.tolist(), boxes, confidences)
+        ]
@@ -0,0 +1,90 @@
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Detector backends. Every backend hands back an ultralytics model object
+# (torch weights or an ONNX session wrapped by ultralytics' AutoBackend), so
+# yolov8_detector runs the same pre/post-processing and builds the same
+# detection dicts whichever one is active.
+#
+# Select one with DETECTOR_BACKEND=torch|onnx|int8. Exported ONNX files are
+# written next to the .pt weights (or to DETECTOR_MODEL_DIR) and reused.
+
+class DetectorBackend:
+    name = "base"
+    description = ""
+
+    def __init__(self, model_name: str, model_dir: str = ""):
+        self.model_name = model_name
+        self.model_dir = model_dir
+
+    def weights_path(self, suffix: str) -> str:
+        return os.path.join(self.model_dir, f"{self.model_name}{suffix}")
+
+    def prepare(self) -> str:
+        """Make sure the weights for this backend exist and return their path.
+
+        Exports are expensive, so run this once (e.g. in the parent process
+        before inference workers start) rather than in every worker.
+        """
+        raise NotImplementedError
+
+    def load(self):
+        from ultralytics import YOLO
+        return YOLO(self.prepare(), task='detect')
+
+class TorchBackend(DetectorBackend):
+    name = "torch"
+    description = "ultralytics PyTorch model"
+
+    def prepare(self) -> str:
+        return self.weights_path(".pt")
+
+class OnnxBackend(DetectorBackend):
+    name = "onnx"
+    description = "ONNX export run by onnxruntime on CPU"
+
+    def prepare(self) -> str:
+        # Export once, with a dynamic batch axis so batched calls still work
+        onnx_path = self.weights_path(".onnx")
+        if not os.path.exists(onnx_path):
+            from ultralytics import YOLO
+            logger.info(f"Exporting {self.model_name} to ONNX")
+            exported = YOLO(self.weights_path(".pt"), task='detect').export(format="onnx", dynamic=True)
+            if os.path.abspath(exported) != os.path.abspath(onnx_path):
+                os.replace(exported, onnx_path)
+        return onnx_path
+
+class Int8Backend(OnnxBackend):
+    name = "int8"
+    description = "dynamically quantized INT8 ONNX model on CPU"
+
+    def prepare(self) -> str:
+        int8_path = self.weights_path("-int8.onnx")
+        if not os.path.exists(int8_path):
+            import onnx
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+
+            onnx_path = super().prepare()
+            logger.info(f"Quantizing {self.model_name} to INT8")
+            quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QUInt8)
+
+            # ultralytics reads class names and input size from the model
+            # metadata, which the quantizer doesn't carry over
+            source = onnx.load(onnx_path)
+            quantized = onnx.load(int8_path)
+            del quantized.metadata_props[:]
+            quantized.metadata_props.extend(source.metadata_props)
+            onnx.save(quantized, int8_path)
+        return int8_path
+
+BACKENDS = {backend.name: backend for backend in (TorchBackend, OnnxBackend, Int8Backend)}
+
+def get_backend(model_name: str) -> DetectorBackend:
+    """Build the backend selected by DETECTOR_BACKEND (default: torch)"""
+    name = os.getenv("DETECTOR_BACKEND", "torch").lower()
+    if name not in BACKENDS:
+        logger.warning(f"Unknown DETECTOR_BACKEND '{name}', falling back to torch")
+        name = "torch"
+    return BACKENDS[name](model_name, os.getenv("DETECTOR_MODEL_DIR", ""))
@@ -0,0 +1,43 @@
+import os
+import hashlib
+from typing import Iterable, Optional
+
+from .two_tier_cache import TwoTierCache
+
+class ExplanationStoreConfig:
+    MEMORY_ENTRIES = int(os.getenv("EXPLANATION_STORE_SIZE", 4096))
+    REDIS_TTL = int(os.getenv("EXPLANATION_STORE_TTL", 30 * 24 * 3600))
+    REDIS_PREFIX = "explanations"
+
+def normalize(text) -> str:
+    return " ".join(str(text).split()).lower()
+
+class ExplanationStore:
+    """Answer explanations keyed by question, chosen option, correct answer
+    and the full option list.
+
+    Filled ahead of time when questions are generated, so /explain can
+    usually answer without calling the LLM. Kept in a TwoTierCache (an
+    in-process LRU plus the shared Redis connection).
+    """
+
+    def __init__(self, max_entries: int = ExplanationStoreConfig.MEMORY_ENTRIES):
+        self._cache = TwoTierCache("Explanation store", max_entries, ExplanationStoreConfig.REDIS_TTL)
+
+    @staticmethod
+    def make_key(question: str, selected: str, answer: str, options: Iterable[str]) -> str:
+        # The prompt lists the options, so they're part of the key (in any order)
+        parts = [normalize(p) for p in (question, selected, answer)] + sorted(normalize(o) for o in options)
+        digest = hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+        return f"{ExplanationStoreConfig.REDIS_PREFIX}:{digest}"
+
+    def get(self, question: str, selected: str, answer: str, options: Iterable[str]) -> Optional[str]:
+        return self._cache.get(self.make_key(question, selected, answer, options))
+
+    def set(self, question: str, selected: str, answer: str, options: Iterable[str], explanation: str):
+        self._cache.set(self.make_key(question, selected, answer, options), explanation)
+
+    def stats(self):
+        return self._cache.stats()
+
+explanation_store = ExplanationStore()
@@ -0,0 +1,187 @@
+import os
+import shutil
+import itertools
+import logging
+import subprocess
+import threading
+from typing import Iterable, Iterator, Optional, Tuple
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = (".mp4", ".webm", ".mkv", ".mov", ".avi")
+
+def find_local_video(video_dir: Optional[str], video_id: str) -> Optional[str]:
+    """Return the path of a self-hosted copy of video_id, if there is one"""
+    if not video_dir:
+        return None
+    for ext in VIDEO_EXTENSIONS:
+        path = os.path.join(video_dir, f"{video_id}{ext}")
+        if os.path.isfile(path):
+            return path
+    return None
+
+class VideoFrameReader:
+    """Decode frames at chosen timestamps from a local or mounted video file.
+
+    Frames are read one at a time by seeking, so the video is never loaded
+    into memory. OpenCV is used when it can open the file; otherwise (or if
+    a seek fails) each frame is extracted with the ffmpeg binary.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._capture = None
+        self._closed = False
+        self._ffmpeg = shutil.which("ffmpeg")
+        # VideoCapture isn't safe to seek from several threads at once
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        capture = cv2.VideoCapture(self.path)
+        if capture.isOpened():
+            self._capture = capture
+        else:
+            capture.release()
+            if not self._ffmpeg:
+                raise IOError(f"Cannot open {self.path} with OpenCV and ffmpeg is not installed")
+            logger.info(f"OpenCV cannot open {self.path}, using ffmpeg")
+
+    def close(self):
+        # Waits for a read still running on an executor thread
+        with self._lock:
+            self._closed = True
+            if self._capture is not None:
+                self._capture.release()
+                self._capture = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Video length in seconds, or None if it can't be determined"""
+        if self._capture is not None:
+            fps = self._capture.get(cv2.CAP_PROP_FPS)
+            frames = self._capture.get(cv2.CAP_PROP_FRAME_COUNT)
+            if fps > 0 and frames > 0:
+                return frames / fps
+        return self._probe_duration()
+
+    def read_at(self, timestamp: float) -> Optional[np.ndarray]:
+        """Decode the frame shown at timestamp (seconds) as a BGR array, or
+        None once the reader has been closed"""
+        with self._lock:
+            # Checked under the lock, since close() may run concurrently.
+            # Reads left over from a cancelled analysis stop here rather
+            # than starting ffmpeg for frames nobody will use.
+            if self._closed:
+                return None
+            if self._capture is not None:
+                self._capture.set(cv2.CAP_PROP_POS_MSEC, timestamp * 1000)
+                ok, frame = self._capture.read()
+                if ok:
+                    return frame
+                logger.debug(f"OpenCV seek to {timestamp}s failed in {self.path}")
+        return self._ffmpeg_frame(timestamp)
+
+    def iter_frames(self, timestamps: Iterable[float]) -> Iterator[Tuple[float, np.ndarray]]:
+        """Yield (timestamp, frame) in ascending time order, skipping frames
+        that can't be decoded (e.g. timestamps past the end)"""
+        for timestamp in sorted(timestamps):
+            frame = self.read_at(timestamp)
+            if frame is not None:
+                yield timestamp, frame
+
+    def sample_frames(self, interval: float, size: Tuple[int, int] = (64, 36)) -> Tuple[np.ndarray, np.ndarray]:
+        """Decode a small grayscale frame every interval seconds.
+
+        Returns (timestamps, frames) with frames stacked as a (N, h, w) uint8
+        array. With OpenCV each sample is its own seek, so only the frames
+        around it are decoded and the lock is held one sample at a time.
+        """
+        if self._capture is not None:
+            return self._sample_opencv(interval, size)
+        return self._sample_ffmpeg(interval, size)
+
+    def _sample_opencv(self, interval, size):
+        duration = self.duration
+        timestamps, frames = [], []
+        for i in itertools.count():
+            timestamp = i * interval
+            if duration is not None and timestamp >= duration:
+                break
+            with self._lock:
+                if self._capture is None:
+                    break
+                self._capture.set(cv2.CAP_PROP_POS_MSEC, timestamp * 1000)
+                ok, frame = self._capture.read()
+            if not ok:
+                # Without a known length, a failed seek means the end
+                if duration is None:
+                    break
+                continue
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            frames.append(cv2.resize(gray, size, interpolation=cv2.INTER_AREA))
+            timestamps.append(timestamp)
+        return self._stack(timestamps, frames, size)
+
+    def _sample_ffmpeg(self, interval, size):
+        width, height = size
+        frame_bytes = width * height
+        process = subprocess.Popen(
+            [self._ffmpeg, "-v", "error", "-i", self.path,
+             "-vf", f"fps=1/{interval},scale={width}:{height},format=gray",
+             "-f", "rawvideo", "-"],
+            stdout=subprocess.PIPE
+        )
+        timestamps, frames = [], []
+        try:
+            while True:
+                data = process.stdout.read(frame_bytes)
+                if len(data) < frame_bytes:
+                    break
+                frames.append(np.frombuffer(data, dtype=np.uint8).reshape(height, width))
+                timestamps.append(len(timestamps) * interval)
+        finally:
+            process.stdout.close()
+            process.wait()
+        return self._stack(timestamps, frames, size)
+
+    @staticmethod
+    def _stack(timestamps, frames, size):
+        if not frames:
+            return np.empty(0), np.empty((0, size[1], size[0]), dtype=np.uint8)
+        return np.asarray(timestamps), np.stack(frames)
+
+    def _ffmpeg_frame(self, timestamp: float) -> Optional[np.ndarray]:
+        if not self._ffmpeg:
+            return None
+        # -ss before -i seeks on the input, so only the nearby GOP is decoded
+        result = subprocess.run(
+            [self._ffmpeg, "-v", "error", "-ss", str(timestamp), "-i", self.path,
+             "-frames:v", "1", "-f", "image2pipe", "-vcodec", "bmp", "-"],
+            capture_output=True, timeout=30
+        )
+        if result.returncode != 0 or not result.stdout:
+            return None
+        return cv2.imdecode(np.frombuffer(result.stdout, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    def _probe_duration(self) -> Optional[float]:
+        ffprobe = shutil.which("ffprobe")
+        if not ffprobe:
+            return None
+        result = subprocess.run(
+            [ffprobe, "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", self.path],
+            capture_output=True, text=True, timeout=30
+        )
+        try:
+            return float(result.stdout.strip())
+        except ValueError:
+            return None
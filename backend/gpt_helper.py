@@ -7,10 +7,18 @@ import time
 from tenacity import retry, stop_after_attempt, wait_exponential
 # Load OpenAI API key from .env file
 
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+import asyncio
+from backend.llm_cache import llm_cache
 
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Shared async client; OPENAI_CONCURRENCY caps in-flight requests app-wide
+async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+openai_limit = asyncio.Semaphore(int(os.getenv("OPENAI_CONCURRENCY", 4)))
+# Background work (precomputed explanations) gets its own, smaller limit so
+# it never holds slots that requests are waiting on
+openai_background_limit = asyncio.Semaphore(int(os.getenv("OPENAI_BACKGROUND_CONCURRENCY", 1)))
 
 # --- Safely extract JSON from GPT response ---
 def safe_parse_json(json_str):
@@ -23,18 +31,67 @@ def safe_parse_json(json_str):
         print(f"[❌] JSON parsing error: {e}")
         return None
 
+# --- Chat completions through the response cache ---
+def chat_completion(prompt, temperature, parse, use_cache=True, is_complete=None, model="gpt-4o"):
+    """Send prompt (or reuse an identical earlier response) and return
+    parse(content). Responses are only cached once parse accepts them and,
+    if given, is_complete(parsed) is true; pass use_cache=False to bypass."""
+    key = llm_cache.make_key(model, temperature, prompt)
+    if use_cache:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            return parse(cached)
+
+    response = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=temperature,
+    )
+    content = response.choices[0].message.content
+    parsed = parse(content)
+    if is_complete is None or is_complete(parsed):
+        llm_cache.set(key, content)
+    return parsed
+
+async def achat_completion(prompt, temperature, parse, use_cache=True, is_complete=None, model="gpt-4o",
+                           limit=None):
+    """Async chat_completion on the shared client, within limit (default
+    openai_limit, i.e. OPENAI_CONCURRENCY)"""
+    key = llm_cache.make_key(model, temperature, prompt)
+    if use_cache:
+        cached = await asyncio.to_thread(llm_cache.get, key)
+        if cached is not None:
+            return parse(cached)
+
+    async with limit or openai_limit:
+        response = await async_client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+        )
+    content = response.choices[0].message.content
+    parsed = parse(content)
+    if is_complete is None or is_complete(parsed):
+        await asyncio.to_thread(llm_cache.set, key, content)
+    return parsed
+
 # --- Generate multiple-choice question from detected labels ---
-def generate_mcq_from_labels(labels):
-    if not labels:
-        return {
-            "text": "No objects detected to generate a question.",
-            "options": [],
-            "answer": ""
-        }
+NO_LABELS_QUESTION = {
+    "text": "No objects detected to generate a question.",
+    "options": [],
+    "answer": ""
+}
+
+LABELS_FALLBACK_QUESTION = {
+    "text": "Let's explore what's in the video!",
+    "options": [],
+    "answer": ""
+}
 
+def build_mcq_prompt(labels):
     joined = ", ".join([obj["label"] for obj in labels])
 
-    prompt = f"""
+    return f"""
 You are a friendly teacher creating fun quiz questions for children.
 
 Based on these detected objects: {joined}, generate ONE multiple-choice question
@@ -49,44 +106,66 @@ Respond with ONLY this JSON format:
 }}
 """
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.5,
-        )
+def parse_mcq_response(raw_response):
+    parsed = safe_parse_json(raw_response)
+
+    if not parsed:
+        raise ValueError("Invalid JSON format from GPT")
 
-        raw_response = response.choices[0].message.content
-        parsed = safe_parse_json(raw_response)
+    if not all(k in parsed for k in ["text", "options", "answer"]):
+        raise ValueError("Missing keys in GPT response")
 
-        if not parsed:
-            raise ValueError("Invalid JSON format from GPT")
+    if not isinstance(parsed["options"], list) or len(parsed["options"]) != 4:
+        raise ValueError("Expected 4 options in 'options' list")
 
-        if not all(k in parsed for k in ["text", "options", "answer"]):
-            raise ValueError("Missing keys in GPT response")
+    return parsed
 
-        if not isinstance(parsed["options"], list) or len(parsed["options"]) != 4:
-            raise ValueError("Expected 4 options in 'options' list")
+def generate_mcq_from_labels(labels, use_cache=True):
+    if not labels:
+        return dict(NO_LABELS_QUESTION)
+
+    prompt = build_mcq_prompt(labels)
 
-        return parsed
+    try:
+        return chat_completion(prompt, 0.5, parse_mcq_response, use_cache)
 
-    except openai.error.RateLimitError:
+    except openai.RateLimitError:
         print("⚠️ Rate limit hit, waiting before retry...")
         time.sleep(20)  # Wait 20 seconds before retrying
         raise  # This will trigger the retry
 
     except Exception as e:
         print(f"[⚠️] GPT MCQ generation failed: {str(e)}")
-        return {
-            "text": "Let's explore what's in the video!",
-            "options": [],
-            "answer": ""
-        }
+        return dict(LABELS_FALLBACK_QUESTION)
+
+async def agenerate_mcq_from_labels(labels, use_cache=True):
+    """Async generate_mcq_from_labels on the shared client"""
+    if not labels:
+        return dict(NO_LABELS_QUESTION)
+
+    prompt = build_mcq_prompt(labels)
+
+    try:
+        return await achat_completion(prompt, 0.5, parse_mcq_response, use_cache)
+
+    except openai.RateLimitError:
+        print("⚠️ Rate limit hit, waiting before retry...")
+        await asyncio.sleep(20)
+        raise
+
+    except Exception as e:
+        print(f"[⚠️] GPT MCQ generation failed: {str(e)}")
+        return dict(LABELS_FALLBACK_QUESTION)
 
 # --- Generate MCQ from YouTube transcript ---
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-def generate_questions_from_transcript(title: str, transcript: str):
-    prompt = f"""
+TRANSCRIPT_FALLBACK_QUESTION = {
+    "text": "What do you think this video is about?",
+    "options": [],
+    "answer": ""
+}
+
+def build_transcript_prompt(title: str, transcript: str):
+    return f"""
 You are a friendly educational assistant for children. Read the transcript of a YouTube video below and create a fun multiple-choice question **in English**, even if the video is in another language.
 
 Transcript (up to 1000 characters):
@@ -106,29 +185,144 @@ Respond with ONLY this JSON:
 }}
 """
 
+def parse_transcript_response(content):
+    parsed = safe_parse_json(content)
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.5,
-        )
+    if not parsed:
+        raise ValueError("Failed to parse GPT response")
 
-        content = response.choices[0].message.content
-        parsed = safe_parse_json(content)
+    if not all(k in parsed for k in ["text", "options", "answer"]):
+        raise ValueError("Incomplete response from GPT")
 
-        if not parsed:
-            raise ValueError("Failed to parse GPT response")
+    return parsed
 
-        if not all(k in parsed for k in ["text", "options", "answer"]):
-            raise ValueError("Incomplete response from GPT")
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+def generate_questions_from_transcript(title: str, transcript: str, use_cache=True):
+    prompt = build_transcript_prompt(title, transcript)
 
-        return parsed
+    try:
+        return chat_completion(prompt, 0.5, parse_transcript_response, use_cache)
+
+    except Exception as e:
+        print(f"[❌] Transcript GPT error: {str(e)}")
+        return dict(TRANSCRIPT_FALLBACK_QUESTION)
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+async def agenerate_questions_from_transcript(title: str, transcript: str, use_cache=True):
+    """Async generate_questions_from_transcript on the shared client"""
+    prompt = build_transcript_prompt(title, transcript)
+
+    try:
+        return await achat_completion(prompt, 0.5, parse_transcript_response, use_cache)
 
     except Exception as e:
         print(f"[❌] Transcript GPT error: {str(e)}")
-        return {
-            "text": "What do you think this video is about?",
-            "options": [],
-            "answer": ""
-        }
+        return dict(TRANSCRIPT_FALLBACK_QUESTION)
+
+# --- Generate one MCQ per transcript section in a single request ---
+def format_timestamp(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+def build_sections_prompt(title: str, sections):
+    excerpts = "\n\n".join(
+        f"Section {number} ({format_timestamp(start)}–{format_timestamp(end)}):\n\"\"\"{text[:1000]}\"\"\""
+        for number, (start, end, text) in sections.items()
+    )
+    return f"""
+You are a friendly educational assistant for children. Below are excerpts from different parts of the YouTube video "{title}", each tagged with its section number and time window. For EACH section, create one fun multiple-choice question **in English** about that section only, even if the video is in another language.
+
+{excerpts}
+
+Make sure:
+- The question and all options are in English.
+- It should be related to what kids might learn from that part of the video.
+- Provide 4 answer choices, and pick the correct one.
+- Keep language easy for children to understand.
+
+Respond with ONLY a JSON array containing one object per section:
+[
+  {{
+    "section": 1,
+    "text": "Your question?",
+    "options": ["A", "B", "C", "D"],
+    "answer": "Correct Answer"
+  }}
+]
+"""
+
+def parse_sections_response(content, expected):
+    """Valid questions from a batched response, keyed by section number"""
+    parsed = safe_parse_json(content)
+    if not isinstance(parsed, list):
+        print("[⚠️] Batched GPT response is not a JSON array")
+        return {}
+
+    questions = {}
+    for item in parsed:
+        if not isinstance(item, dict) or item.get("section") not in expected:
+            continue
+        if not all(k in item for k in ["text", "options", "answer"]):
+            continue
+        if not isinstance(item["options"], list) or len(item["options"]) != 4:
+            continue
+        if item["answer"] not in item["options"]:
+            continue
+        number = item.pop("section")
+        questions.setdefault(number, item)
+    return questions
+
+async def agenerate_questions_for_sections(title: str, sections, max_rounds: int = 2, use_cache=True):
+    """Generate one question per (start, end, text) section with one chat
+    completion, then re-request only the sections whose questions were
+    missing or invalid. Returns questions in section order; sections still
+    missing after max_rounds get the fallback question."""
+    pending = {number: section for number, section in enumerate(sections, start=1)}
+    questions = {}
+
+    for _ in range(max_rounds):
+        if not pending:
+            break
+        expected = pending
+        try:
+            # Only fully valid batches are cached, so a retry never replays a partial one
+            received = await achat_completion(
+                build_sections_prompt(title, pending), 0.5,
+                lambda content: parse_sections_response(content, expected), use_cache,
+                is_complete=lambda parsed: len(parsed) == len(expected)
+            )
+        except Exception as e:
+            print(f"[❌] Batched transcript GPT error: {str(e)}")
+            received = {}
+
+        questions.update(received)
+        pending = {number: section for number, section in pending.items() if number not in received}
+
+    if pending:
+        print(f"[⚠️] No valid question for sections {sorted(pending)}")
+    return [questions.get(number, dict(TRANSCRIPT_FALLBACK_QUESTION))
+            for number in range(1, len(sections) + 1)]
+
+# --- Explain a quiz answer ---
+EXPLANATION_FALLBACK = "Oops! Something went wrong trying to explain the answer."
+
+def build_explanation_prompt(question, selected_label, answer, options):
+    return f"""
+You are an AI tutor for kids. A student gave a wrong answer to the following quiz:
+
+❓ Question: {question}
+🟰 Their Answer: {selected_label}
+✅ Correct Answer: {answer}
+
+Options: {', '.join(options)}
+
+If the answer is incorrect, please explain *briefly* and kindly why the answer is incorrect, and encourage them to try again or rewatch the video.
+If the answer is correct, please explain *briefly* and kindly why the answer is correct. Respond with a single friendly sentence.
+"""
+
+async def agenerate_explanation(question, selected_label, answer, options, use_cache=True, background=False):
+    """One friendly sentence on why selected_label is right or wrong.
+    background=True runs under openai_background_limit instead."""
+    prompt = build_explanation_prompt(question, selected_label, answer, options)
+    limit = openai_background_limit if background else openai_limit
+    return await achat_completion(prompt, 0.7, lambda content: content.strip(), use_cache, limit=limit)
@@ -0,0 +1,54 @@
+# Application-wide async HTTP client for outbound calls (YouTube API,
+# thumbnail CDN). Connections are kept alive and reused between requests;
+# main.py opens the client at startup and closes it at shutdown.
+import asyncio
+import os
+from typing import Dict
+from urllib.parse import urlsplit
+import httpx
+
+class HttpConfig:
+    MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 50))
+    MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20))
+    KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))
+    # Concurrent requests allowed to any one host
+    MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", 10))
+    TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 10))
+    CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+
+_client = None
+_host_limits: Dict[str, asyncio.Semaphore] = {}
+
+def start():
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HttpConfig.MAX_CONNECTIONS,
+                max_keepalive_connections=HttpConfig.MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HttpConfig.KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(HttpConfig.TIMEOUT, connect=HttpConfig.CONNECT_TIMEOUT),
+            follow_redirects=True,
+        )
+    return _client
+
+async def close():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    _host_limits.clear()
+
+def get_http_client() -> httpx.AsyncClient:
+    """The shared client, opened on first use outside the app (e.g. scripts)"""
+    return start()
+
+async def get(url: str, **kwargs) -> httpx.Response:
+    """GET through the shared client, at most MAX_PER_HOST at a time per host"""
+    host = urlsplit(url).netloc
+    limit = _host_limits.get(host)
+    if limit is None:
+        limit = _host_limits[host] = asyncio.Semaphore(HttpConfig.MAX_PER_HOST)
+    async with limit:
+        return await get_http_client().get(url, **kwargs)
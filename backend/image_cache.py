@@ -0,0 +1,205 @@
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from . import http_client
+
+logger = logging.getLogger(__name__)
+
+class ImageCacheConfig:
+    DIRECTORY = os.getenv("IMAGE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "piggyback-image-cache"))
+    MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+    # Used when the server sends no Cache-Control max-age
+    DEFAULT_MAX_AGE = int(os.getenv("IMAGE_CACHE_MAX_AGE", 24 * 3600))
+    # How long a 404 is remembered before the URL is tried again
+    NEGATIVE_TTL = int(os.getenv("IMAGE_CACHE_NEGATIVE_TTL", 6 * 3600))
+
+MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+class ImageCache:
+    """Disk cache for fetched images (thumbnails), keyed by URL.
+
+    Each entry is a body file plus a small JSON metadata file. Fresh entries
+    are served without touching the network; stale ones are revalidated
+    with If-None-Match / If-Modified-Since, and 404s are remembered for
+    NEGATIVE_TTL. Entries (body and metadata together, so remembered 404s
+    count too) are evicted least recently used first once the directory
+    grows past max_bytes.
+    """
+
+    def __init__(self, directory: str = ImageCacheConfig.DIRECTORY,
+                 max_bytes: int = ImageCacheConfig.MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None  # key -> bytes on disk, least recently used first
+        self._total_bytes = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    async def fetch(self, url: str) -> Optional[bytes]:
+        """Return the image at url, or None if it's missing or unreachable"""
+        key = self.make_key(url)
+        meta, body = await asyncio.to_thread(self._load, key)
+        now = time.time()
+
+        if meta and now < meta["expires_at"]:
+            if meta["status"] == 404:
+                self.negative_hits += 1
+                return None
+            if body is not None:
+                self.hits += 1
+                return body
+
+        headers = {}
+        if meta and meta["status"] == 200 and body is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            response = await http_client.get(url, headers=headers)
+        except Exception as e:
+            logger.warning(f"Image fetch failed for {url}: {str(e)}")
+            return None
+
+        if response.status_code == 304 and headers:
+            self.revalidated += 1
+            meta["expires_at"] = now + self._max_age(response)
+            await asyncio.to_thread(self._store, key, meta, None)
+            return body
+
+        self.misses += 1
+        if response.status_code == 200:
+            meta = {
+                "url": url,
+                "status": 200,
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "expires_at": now + self._max_age(response),
+            }
+            await asyncio.to_thread(self._store, key, meta, response.content)
+            return response.content
+        if response.status_code == 404:
+            meta = {"url": url, "status": 404, "expires_at": now + ImageCacheConfig.NEGATIVE_TTL}
+            await asyncio.to_thread(self._store, key, meta, None)
+        return None
+
+    @staticmethod
+    def _max_age(response) -> int:
+        match = MAX_AGE_PATTERN.search(response.headers.get("cache-control", ""))
+        return int(match.group(1)) if match else ImageCacheConfig.DEFAULT_MAX_AGE
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + ".json", base + ".body"
+
+    def _ensure_index(self):
+        # Rebuild the LRU order from file modification times on first use
+        if self._index is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        entries = {}
+        for entry in os.scandir(self.directory):
+            key, ext = os.path.splitext(entry.name)
+            if ext in (".json", ".body"):
+                stat = entry.stat()
+                mtime, size = entries.get(key, (0, 0))
+                entries[key] = (max(mtime, stat.st_mtime), size + stat.st_size)
+        self._index = OrderedDict(
+            (key, size) for key, (_, size) in sorted(entries.items(), key=lambda item: item[1][0])
+        )
+        self._total_bytes = sum(self._index.values())
+
+    def _load(self, key):
+        meta_path, body_path = self._paths(key)
+        with self._lock:
+            self._ensure_index()
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                os.utime(meta_path)
+            except (OSError, ValueError):
+                return None, None
+            if key in self._index:
+                self._index.move_to_end(key)
+            body = None
+            if meta["status"] == 200:
+                try:
+                    with open(body_path, "rb") as f:
+                        body = f.read()
+                except OSError:
+                    pass
+            return meta, body
+
+    def _store(self, key, meta, body: Optional[bytes]):
+        meta_path, body_path = self._paths(key)
+        with self._lock:
+            self._ensure_index()
+            if body is not None:
+                self._write(body_path, body)
+            elif meta["status"] != 200:
+                self._remove_file(body_path)
+            self._write(meta_path, json.dumps(meta).encode())
+
+            size = sum(os.path.getsize(path) for path in (meta_path, body_path) if os.path.exists(path))
+            self._total_bytes += size - self._index.get(key, 0)
+            self._index[key] = size
+            self._index.move_to_end(key)
+            self._evict()
+
+    @staticmethod
+    def _write(path, data: bytes):
+        # Write then rename so readers never see a partial file
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _forget(self, key):
+        self._total_bytes -= self._index.pop(key, 0)
+        for path in self._paths(key):
+            self._remove_file(path)
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            key = next(iter(self._index))
+            self._forget(key)
+
+    def stats(self):
+        with self._lock:
+            self._ensure_index()
+            entries, total_bytes = len(self._index), self._total_bytes
+        return {
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+        }
+
+image_cache = ImageCache()
@@ -0,0 +1,244 @@
+import os
+import base64
+import asyncio
+import logging
+import multiprocessing
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+from . import yolov8_detector
+from .batching import MicroBatcher
+from .detection_cache import detection_cache
+from .detections import Detections
+from .inference_profiles import DEFAULT_PROFILE, PROFILES, get_profile
+from .shared_redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Dedicated process pool for YOLO inference. Each worker process loads the
+# model once; frames are handed over through shared memory so only a small
+# descriptor gets pickled per image.
+
+def _available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+class PoolConfig:
+    CORES = _available_cores()
+    # INFERENCE_WORKERS=0 runs inference in-process on a thread instead
+    WORKERS = int(os.getenv("INFERENCE_WORKERS", max(1, CORES // 2)))
+    TORCH_THREADS = max(1, CORES // max(1, WORKERS))
+
+_executor = None
+_state = {"status": "not_started", "error": None}
+
+# --- Worker side ---
+def _init_worker(torch_threads: int):
+    import torch
+    torch.set_num_threads(torch_threads)
+    yolov8_detector.warmup()
+
+def _worker_status():
+    return yolov8_detector.get_status()
+
+def _load_shared(spec):
+    """Copy one frame out of shared memory, decoding it if it's encoded"""
+    name, shape, dtype, encoded = spec
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        view = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        try:
+            # The model keeps references to its last inputs, so it must get
+            # its own copy rather than a view into the block
+            return yolov8_detector.decode_image(view.data) if encoded else view.copy()
+        except Exception as e:
+            print(f"Image decode error: {str(e)}")
+            return None
+        finally:
+            del view
+    finally:
+        block.close()
+
+def _detect_shared(specs, profile_name):
+    frames = [_load_shared(spec) if spec else None for spec in specs]
+    return yolov8_detector.try_detect_batch(frames, profile_name)
+
+# --- API side ---
+def _to_shared(image):
+    """Copy an image into a new shared memory block.
+
+    Decoded frames are shared as-is; encoded bytes (or legacy base64
+    strings) are shared as a flat uint8 buffer and decoded by the worker.
+    """
+    if isinstance(image, np.ndarray):
+        array, encoded = np.ascontiguousarray(image), False
+    else:
+        if isinstance(image, str):
+            image = base64.b64decode(image)
+        array, encoded = np.frombuffer(image, dtype=np.uint8), True
+
+    if array.nbytes == 0:
+        return None, None
+
+    block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str, encoded)
+
+def start():
+    """Create the worker pool; each process loads the model as it spawns"""
+    global _executor
+    if _executor is not None or PoolConfig.WORKERS <= 0:
+        return _executor
+
+    # spawn avoids forking a parent that may already hold torch threads
+    _executor = ProcessPoolExecutor(
+        max_workers=PoolConfig.WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(PoolConfig.TORCH_THREADS,)
+    )
+    _state["status"] = "loading"
+    logger.info(f"Starting {PoolConfig.WORKERS} inference workers "
+                f"with {PoolConfig.TORCH_THREADS} torch threads each")
+    return _executor
+
+async def warmup():
+    """Spin up every worker; the initializer loads and warms the model"""
+    if PoolConfig.WORKERS <= 0:
+        await asyncio.to_thread(yolov8_detector.warmup)
+        status = yolov8_detector.get_status()
+        _state.update(status=status["status"], error=status["error"])
+        return
+
+    loop = asyncio.get_running_loop()
+    _state["status"] = "loading"
+    try:
+        # Export/quantize once here so workers don't race to write the files
+        await asyncio.to_thread(yolov8_detector.BACKEND.prepare)
+        executor = start()
+        # Submitting one task per worker makes the pool spawn all of them
+        statuses = await asyncio.gather(*[
+            loop.run_in_executor(executor, _worker_status)
+            for _ in range(PoolConfig.WORKERS)
+        ])
+        errors = [s["error"] for s in statuses if s["status"] != "ready"]
+        if errors:
+            _state.update(status="error", error=errors[0])
+        else:
+            _state.update(status="ready", error=None)
+    except Exception as e:
+        logger.error(f"Inference pool warmup failed: {str(e)}")
+        _state.update(status="error", error=str(e))
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _state.update(status="not_started", error=None)
+
+def get_status():
+    return {
+        "status": _state["status"],
+        "model": yolov8_detector.MODEL_NAME,
+        "backend": yolov8_detector.BACKEND.name,
+        "backend_description": yolov8_detector.BACKEND.description,
+        "error": _state["error"],
+        "workers": PoolConfig.WORKERS,
+        "torch_threads": PoolConfig.TORCH_THREADS
+    }
+
+async def detect_batch(images, profile=DEFAULT_PROFILE, keep_failures=False):
+    """Detect objects in a batch of images on the inference pool.
+
+    Accepts the same inputs as yolov8_detector.detect_objects_batch and
+    returns one columnar Detections per image (empty if the image could not
+    be processed, or None with keep_failures=True). profile names the
+    inference profile to run with; an unknown name raises KeyError. Images
+    already in the detection cache skip inference entirely.
+    """
+    if not images:
+        return []
+
+    # Results differ per backend and per profile, so both are in the key
+    cache_namespace = f"{yolov8_detector.MODEL_ID}/{get_profile(profile).cache_tag}"
+    keys = [
+        None if image is None else detection_cache.make_key(image, cache_namespace)
+        for image in images
+    ]
+    results = await _run_cache_op(detection_cache.get_many, keys)
+
+    missing = [i for i, result in enumerate(results) if result is None and keys[i] is not None]
+    if missing:
+        fresh = await _run_detection([images[i] for i in missing], profile)
+        to_store = []
+        for i, detections in zip(missing, fresh):
+            # Failed images stay uncached so they are retried next time
+            if detections is not None:
+                results[i] = detections
+                to_store.append((keys[i], detections))
+        await _run_cache_op(detection_cache.set_many, to_store)
+
+    if keep_failures:
+        return results
+    return [detections if detections is not None else Detections.empty() for detections in results]
+
+# Concurrent single-image requests arriving within the window share one
+# batched inference call. Requests only batch with others using the same
+# profile.
+detect_batchers = {
+    name: MicroBatcher(
+        partial(detect_batch, profile=name),
+        max_batch_size=int(os.getenv("YOLO_MAX_BATCH_SIZE", 8)),
+        max_wait_ms=float(os.getenv("YOLO_BATCH_WINDOW_MS", 10))
+    )
+    for name in PROFILES
+}
+
+async def stop_batchers():
+    for batcher in detect_batchers.values():
+        await batcher.stop()
+
+async def _run_cache_op(func, arg):
+    # Only the Redis tier does I/O; keep it off the event loop
+    if get_redis_client() is None:
+        return func(arg)
+    return await asyncio.to_thread(func, arg)
+
+async def _run_detection(images, profile):
+    """Run inference for images, returning None for any that failed"""
+    if PoolConfig.WORKERS <= 0:
+        return await asyncio.to_thread(yolov8_detector.try_detect_batch, images, profile)
+
+    executor = start()
+    blocks = []
+    try:
+        specs = []
+        for image in images:
+            try:
+                block, spec = _to_shared(image)
+            except Exception as e:
+                logger.error(f"Could not share frame with inference pool: {str(e)}")
+                block, spec = None, None
+            if block is not None:
+                blocks.append(block)
+            specs.append(spec)
+
+        future = executor.submit(_detect_shared, specs, profile)
+    except BaseException:
+        _release_blocks(blocks)
+        raise
+
+    # The worker may still be reading the blocks after this coroutine is
+    # cancelled, so they are released only once the worker call finishes
+    future.add_done_callback(lambda _: _release_blocks(blocks))
+    return await asyncio.wrap_future(future)
+
+def _release_blocks(blocks):
+    for block in blocks:
+        block.close()
+        block.unlink()
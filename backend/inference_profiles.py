@@ -0,0 +1,113 @@
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLASSES_FILE = Path(__file__).resolve().parent.parent / "classes.txt"
+
+# classes.txt uses the product's words; these are the COCO labels they map to
+COCO_ALIASES = {
+    "plane": ("airplane",),
+    "television": ("tv",),
+    "computer": ("laptop",),
+    "ball": ("sports ball",),
+    "toy": ("teddy bear",),
+    "fruit": ("apple", "banana", "orange"),
+    "vegetable": ("broccoli", "carrot"),
+    "chicken": ("bird",),
+    "rooster": ("bird",),
+    "eagle": ("bird",),
+    "owl": ("bird",),
+    "duck": ("bird",),
+    "penguin": ("bird",),
+}
+
+# Product words that are also COCO labels for something else: COCO "mouse"
+# is a computer mouse and "kite" is the toy, not the animals
+COCO_FALSE_FRIENDS = frozenset({"mouse", "kite"})
+
+# COCO labels kept in every restricted profile. People are in most frames
+# and classes.txt covers them only through body parts and clothes.
+ALWAYS_INCLUDED = ("person",)
+
+def load_product_classes(path: Path = CLASSES_FILE) -> Optional[Tuple[str, ...]]:
+    """Read the object names children are asked about (one per line,
+    comma-separated synonyms), expanded with their COCO aliases"""
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        logger.warning(f"{path} not found, profiles will use all classes")
+        return None
+
+    names = []
+    for line in lines:
+        for name in line.split(","):
+            name = name.strip().lower()
+            if name:
+                if name not in COCO_FALSE_FRIENDS:
+                    names.append(name)
+                names.extend(COCO_ALIASES.get(name, ()))
+    names.extend(ALWAYS_INCLUDED)
+    return tuple(dict.fromkeys(names))
+
+@dataclass(frozen=True)
+class InferenceProfile:
+    """Named model settings for one kind of caller.
+
+    The settings are passed straight to the model, so restricting classes
+    lets NMS and post-processing skip everything else.
+    """
+    name: str
+    imgsz: int = 640
+    conf: float = 0.25
+    max_det: int = 300
+    classes: Optional[Tuple[str, ...]] = None  # label names; None means all
+    _class_ids: Dict = field(default_factory=dict, compare=False, repr=False)
+
+    @cached_property
+    def cache_tag(self) -> str:
+        """Changes whenever a setting that affects results changes"""
+        return f"{self.name}-{hashlib.blake2b(repr(self).encode(), digest_size=4).hexdigest()}"
+
+    def predict_kwargs(self, names: Dict[int, str]) -> Dict:
+        """Keyword arguments for the ultralytics model call"""
+        kwargs = {"imgsz": self.imgsz, "conf": self.conf, "max_det": self.max_det}
+        if self.classes is not None:
+            kwargs["classes"] = self.class_ids(names)
+        return kwargs
+
+    def class_ids(self, names: Dict[int, str]):
+        # Resolved once per label map, since the ids depend on it
+        key = tuple(names.items())
+        if key not in self._class_ids:
+            wanted = set(self.classes)
+            ids = [i for i, label in names.items() if str(label).lower() in wanted]
+            if not ids:
+                logger.warning(f"Profile '{self.name}' matches no model classes, using all")
+            self._class_ids[key] = ids or None
+        return self._class_ids[key]
+
+PRODUCT_CLASSES = load_product_classes()
+
+PROFILES = {
+    profile.name: profile for profile in (
+        # Today's behaviour: full resolution, every COCO class
+        InferenceProfile("default"),
+        # Product objects only, full resolution
+        InferenceProfile("kids", classes=PRODUCT_CLASSES),
+        # Uploaded images are already resized to 320x320 by process_image
+        InferenceProfile("quick", imgsz=320, conf=0.35, max_det=20, classes=PRODUCT_CLASSES),
+        # YouTube thumbnails are at most 480x360
+        InferenceProfile("keyframe", imgsz=480, conf=0.35, max_det=20, classes=PRODUCT_CLASSES),
+    )
+}
+
+DEFAULT_PROFILE = "default"
+
+def get_profile(name: Optional[str] = None) -> InferenceProfile:
+    """Look up a profile by name; raises KeyError for unknown names"""
+    return PROFILES[name or DEFAULT_PROFILE]
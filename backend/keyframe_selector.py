@@ -0,0 +1,60 @@
+from typing import List
+import numpy as np
+
+HISTOGRAM_BINS = 32
+
+def gray_histograms(frames: np.ndarray, bins: int = HISTOGRAM_BINS) -> np.ndarray:
+    """Normalised intensity histograms of a (N, h, w) uint8 stack, as (N, bins)"""
+    count = len(frames)
+    pixels = frames.reshape(count, -1)
+    bucket = (pixels.astype(np.int64) * bins) >> 8
+    # Offset each frame's buckets so one bincount fills every histogram
+    bucket += np.arange(count)[:, None] * bins
+    counts = np.bincount(bucket.ravel(), minlength=count * bins).reshape(count, bins)
+    return counts / pixels.shape[1]
+
+def scene_change_scores(frames: np.ndarray) -> np.ndarray:
+    """How different each frame is from the one before it, in [0, 1].
+
+    Averages the histogram distance (catches cuts and lighting changes) with
+    the mean absolute pixel difference (catches changes in layout that keep
+    the same tones). The first frame scores 0.
+    """
+    if len(frames) < 2:
+        return np.zeros(len(frames))
+    histograms = gray_histograms(frames)
+    histogram_distance = 0.5 * np.abs(np.diff(histograms, axis=0)).sum(axis=1)
+    pixel_distance = np.abs(np.diff(frames.astype(np.int16), axis=0)).mean(axis=(1, 2)) / 255
+    return np.concatenate(([0.0], 0.5 * histogram_distance + 0.5 * pixel_distance))
+
+def select_keyframes(
+        timestamps: np.ndarray,
+        frames: np.ndarray,
+        max_keyframes: int,
+        threshold: float = 0.25,
+        min_spacing: float = 10.0,
+        start_offset: float = 0.0
+) -> List[float]:
+    """Timestamps of the frames where a new scene starts, most novel first.
+
+    A frame counts as a scene change when its score reaches threshold and
+    is a local maximum, so a slow fade yields one keyframe rather than a run
+    of them. Picks closer than min_spacing seconds to a more novel pick are
+    dropped. Returns an empty list when the video has no scene changes.
+    """
+    scores = scene_change_scores(frames)
+    if len(scores) < 2:
+        return []
+
+    padded = np.concatenate(([-1.0], scores, [-1.0]))
+    peaks = (scores >= threshold) & (scores >= padded[:-2]) & (scores > padded[2:])
+    peaks &= timestamps >= start_offset
+
+    selected = []
+    for index in np.flatnonzero(peaks)[np.argsort(-scores[peaks], kind="stable")]:
+        timestamp = float(timestamps[index])
+        if all(abs(timestamp - chosen) >= min_spacing for chosen in selected):
+            selected.append(timestamp)
+            if len(selected) == max_keyframes:
+                break
+    return selected
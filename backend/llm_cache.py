@@ -0,0 +1,135 @@
+import os
+import re
+import time
+import hashlib
+import logging
+import sqlite3
+import tempfile
+import threading
+from typing import Optional
+
+from .shared_redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+class LLMCacheConfig:
+    TTL = int(os.getenv("LLM_CACHE_TTL", 30 * 24 * 3600))
+    MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 20000))
+    # Used when Redis isn't configured
+    SQLITE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(tempfile.gettempdir(), "piggyback-llm-cache.sqlite3"))
+    REDIS_PREFIX = "llm"
+
+WHITESPACE = re.compile(r"\s+")
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so formatting-only differences share an entry"""
+    return WHITESPACE.sub(" ", prompt).strip()
+
+class LLMCache:
+    """Completed chat responses keyed by model, temperature and prompt.
+
+    Stored in the shared Redis connection when there is one, otherwise in a
+    local SQLite file. Entries expire after TTL seconds, and once more than
+    max_entries are stored the least recently written (Redis) or read
+    (SQLite) ones are dropped.
+    """
+
+    def __init__(self, sqlite_path: str = LLMCacheConfig.SQLITE_PATH,
+                 max_entries: int = LLMCacheConfig.MAX_ENTRIES):
+        self.sqlite_path = sqlite_path
+        self.max_entries = max_entries
+        self._db = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, temperature: float, prompt: str) -> str:
+        digest = hashlib.sha256(normalize_prompt(prompt).encode()).hexdigest()
+        return f"{LLMCacheConfig.REDIS_PREFIX}:{model}:{temperature}:{digest}"
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            redis_client = get_redis_client()
+            value = redis_client.get(key) if redis_client is not None else self._sqlite_get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {str(e)}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str):
+        try:
+            redis_client = get_redis_client()
+            if redis_client is not None:
+                self._redis_set(redis_client, key, value)
+            else:
+                self._sqlite_set(key, value)
+        except Exception as e:
+            logger.warning(f"LLM cache store failed: {str(e)}")
+
+    def _redis_set(self, redis_client, key, value):
+        index_key = f"{LLMCacheConfig.REDIS_PREFIX}:index"
+        pipe = redis_client.pipeline()
+        pipe.set(key, value, ex=LLMCacheConfig.TTL)
+        # A sorted set of keys by write time lets us trim the oldest
+        pipe.zadd(index_key, {key: time.time()})
+        pipe.zcard(index_key)
+        size = pipe.execute()[-1]
+        if size > self.max_entries:
+            oldest = [k for k, _ in redis_client.zpopmin(index_key, size - self.max_entries)]
+            if oldest:
+                redis_client.delete(*oldest)
+
+    def _connect(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+        return self._db
+
+    def _sqlite_get(self, key):
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            row = db.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND created_at > ?",
+                (key, now - LLMCacheConfig.TTL)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            db.commit()
+            return row[0]
+
+    def _sqlite_set(self, key, value):
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            db.execute("INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?)", (key, value, now, now))
+            db.execute("DELETE FROM llm_cache WHERE created_at <= ?", (now - LLMCacheConfig.TTL,))
+            db.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            db.commit()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis" if get_redis_client() is not None else "sqlite",
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+llm_cache = LLMCache()
@@ -4,6 +4,7 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 import time
 import logging
+import asyncio
 
 
 from backend import db_models, schemas, tools, routers, youtube, yolov8_router
@@ -12,6 +13,7 @@ from backend.routers import crud_test, authentication
 from backend.routers import videos as video_router
 from backend.youtube import retreiveYoutubeMetaData
 from backend.yolov8_router import router as yolo_router
+from backend import inference_pool, http_client
 from backend.schemas import UserCredentials, UserResponse, YouTubeVideo
 
 logging.basicConfig(
@@ -132,7 +134,28 @@ async def startup_message():
         if hasattr(route, "path"):
             print(f"- {route.path}")
 
+@app.on_event("startup")
+async def open_http_client():
+    # One pooled client for all outbound requests
+    http_client.start()
+
+@app.on_event("startup")
+async def warmup_detector():
+    # Spawn the inference workers, each of which loads YOLO and runs a dummy
+    # inference; /yolo/health reports "loading" until they are all ready
+    app.state.detector_warmup = asyncio.create_task(inference_pool.warmup())
+
 @app.on_event("shutdown")
 async def shutdown_message():
     print("🛑 FastAPI is shutting down...")
+    warmup = getattr(app.state, "detector_warmup", None)
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+        try:
+            await warmup
+        except asyncio.CancelledError:
+            pass
+    await inference_pool.stop_batchers()
+    inference_pool.shutdown()
+    await http_client.close()
 
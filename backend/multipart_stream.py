@@ -0,0 +1,104 @@
+from collections import deque
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+class RequestStreamingResponse(StreamingResponse):
+    """StreamingResponse whose body generator may keep reading the request.
+
+    Starlette's StreamingResponse listens for client disconnects on
+    receive() while streaming (on ASGI servers older than spec 2.4), which
+    swallows any request body that hasn't been read yet.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+class UploadedFile:
+    """One file part of a multipart body, held in memory once complete"""
+
+    def __init__(self, index: int, filename: str, data: bytes, error: str = None):
+        self.index = index
+        self.filename = filename
+        self.data = data
+        self.error = error
+
+def get_multipart_boundary(request: Request) -> bytes:
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data body")
+    return boundary
+
+async def iter_multipart_files(request: Request, max_file_size: int):
+    """Yield each file part of a multipart/form-data request as soon as it
+    has been fully received.
+
+    Unlike request.form(), this reads the body incrementally, so at most the
+    current part (plus whatever finished within the last network chunk) is
+    held in memory. Files over max_file_size are yielded with an error and
+    their data dropped. Non-file form fields are ignored.
+    """
+    boundary = get_multipart_boundary(request)
+    completed = deque()
+    part = {}
+    file_count = [0]
+
+    def on_part_begin():
+        part.clear()
+        part.update(headers={}, field=b"", value=b"", chunks=[], size=0, too_large=False)
+
+    def on_header_field(data, start, end):
+        part["field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        part["value"] += data[start:end]
+
+    def on_header_end():
+        part["headers"][part["field"].lower()] = part["value"]
+        part["field"], part["value"] = b"", b""
+
+    def on_part_data(data, start, end):
+        part["size"] += end - start
+        if part["size"] > max_file_size:
+            part["too_large"] = True
+            part["chunks"] = []
+        elif not part["too_large"]:
+            part["chunks"].append(data[start:end])
+
+    def on_part_end():
+        _, options = parse_options_header(part["headers"].get(b"content-disposition", b""))
+        if b"filename" not in options:
+            return
+        index = file_count[0]
+        file_count[0] += 1
+        filename = options[b"filename"].decode("utf-8", "replace")
+        if part["too_large"]:
+            completed.append(UploadedFile(index, filename, b"", f"File exceeds {max_file_size} bytes"))
+        else:
+            completed.append(UploadedFile(index, filename, b"".join(part["chunks"])))
+        part["chunks"] = []
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    async for chunk in request.stream():
+        parser.write(chunk)
+        while completed:
+            yield completed.popleft()
+
+    parser.finalize()
+    while completed:
+        yield completed.popleft()
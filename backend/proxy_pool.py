@@ -0,0 +1,117 @@
+import os
+import time
+import threading
+from typing import Dict, List, Optional
+
+class ProxyPoolConfig:
+    # Weight of the newest sample in the latency / error-rate averages
+    EWMA_ALPHA = float(os.getenv("PROXY_EWMA_ALPHA", 0.3))
+    # Consecutive failures that open a proxy's circuit
+    FAILURE_THRESHOLD = int(os.getenv("PROXY_FAILURE_THRESHOLD", 3))
+    # Seconds an open circuit waits before allowing one trial request
+    OPEN_SECONDS = float(os.getenv("PROXY_OPEN_SECONDS", 60))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class ProxyHealth:
+    """Running latency, error rate and circuit state of one proxy"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency = None  # EWMA seconds, None until the first success
+        self.error_rate = 0.0  # EWMA of failures (0..1)
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def score(self) -> float:
+        # Untried proxies score best so each gets measured
+        if self.latency is None:
+            return 0.0
+        return self.latency * (1 + 4 * self.error_rate)
+
+class ProxyPool:
+    """Picks the healthiest proxy for each request.
+
+    Proxies are ranked by EWMA latency inflated by their EWMA error rate.
+    After FAILURE_THRESHOLD consecutive failures a proxy's circuit opens
+    and it is skipped for OPEN_SECONDS; then one half-open trial request is
+    let through, which closes the circuit on success or reopens it.
+    """
+
+    def __init__(self, proxies: List[str]):
+        self._proxies = {url: ProxyHealth(url) for url in proxies}
+        self._lock = threading.Lock()
+
+    def choose(self) -> Optional[str]:
+        """The best usable proxy, or None if every circuit is open"""
+        now = time.monotonic()
+        with self._lock:
+            usable = []
+            for proxy in self._proxies.values():
+                # A trial that never reported back is retried after the same wait
+                if proxy.state != CLOSED and now - proxy.opened_at >= ProxyPoolConfig.OPEN_SECONDS:
+                    proxy.state = HALF_OPEN
+                    proxy.opened_at = now
+                    # Only this caller gets the trial; others see it as busy
+                    return proxy.url
+                if proxy.state == CLOSED:
+                    usable.append(proxy)
+            if not usable:
+                return None
+            return min(usable, key=ProxyHealth.score).url
+
+    def available(self) -> bool:
+        """Whether choose() would currently return a proxy"""
+        now = time.monotonic()
+        with self._lock:
+            return any(
+                proxy.state == CLOSED or now - proxy.opened_at >= ProxyPoolConfig.OPEN_SECONDS
+                for proxy in self._proxies.values()
+            )
+
+    def record_success(self, url: str, latency: float):
+        alpha = ProxyPoolConfig.EWMA_ALPHA
+        with self._lock:
+            proxy = self._proxies[url]
+            proxy.requests += 1
+            proxy.latency = latency if proxy.latency is None else alpha * latency + (1 - alpha) * proxy.latency
+            proxy.error_rate *= 1 - alpha
+            proxy.consecutive_failures = 0
+            proxy.state = CLOSED
+
+    def record_failure(self, url: str):
+        alpha = ProxyPoolConfig.EWMA_ALPHA
+        with self._lock:
+            proxy = self._proxies[url]
+            proxy.requests += 1
+            proxy.failures += 1
+            proxy.error_rate = alpha + (1 - alpha) * proxy.error_rate
+            proxy.consecutive_failures += 1
+            if proxy.state == HALF_OPEN or proxy.consecutive_failures >= ProxyPoolConfig.FAILURE_THRESHOLD:
+                proxy.state = OPEN
+                proxy.opened_at = time.monotonic()
+
+    def stats(self) -> List[Dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    # Credentials stay out of the stats
+                    "proxy": proxy.url.rsplit("@", 1)[-1],
+                    "state": proxy.state,
+                    "latency_ms": round(proxy.latency * 1000, 1) if proxy.latency is not None else None,
+                    "error_rate": round(proxy.error_rate, 3),
+                    "requests": proxy.requests,
+                    "failures": proxy.failures,
+                    "retry_in_seconds": (
+                        round(max(0.0, ProxyPoolConfig.OPEN_SECONDS - (now - proxy.opened_at)), 1)
+                        if proxy.state == OPEN else None
+                    ),
+                }
+                for proxy in self._proxies.values()
+            ]
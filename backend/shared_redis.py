@@ -0,0 +1,12 @@
+# Redis connection shared by the app's caches. initialize_cache() in
+# routers/videos.py sets it up at startup; None means Redis isn't
+# configured or couldn't be reached, and callers should skip that tier.
+
+_redis_client = None
+
+def set_redis_client(client):
+    global _redis_client
+    _redis_client = client
+
+def get_redis_client():
+    return _redis_client
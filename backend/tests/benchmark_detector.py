@@ -0,0 +1,209 @@
+"""Detector micro-benchmarks.
+
+Times the YOLO detector on the bundled test images (dog.jpg, OIP.jpg)
+across input sizes, batch sizes and torch thread counts, and writes the
+results as JSON so runs on the same CPU-only box can be compared between
+commits.
+
+    python -m backend.tests.benchmark_detector --output bench.json
+    python -m backend.tests.benchmark_detector --compare bench.json
+
+The public yolov8_detector APIs are timed in-process. The pool case times
+inference_pool._run_detection, the path production requests take (shared
+memory handoff to worker processes), minus the detection cache so it
+never short-cuts a measurement. DETECTOR_BACKEND selects the backend as
+usual.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+
+# Keep ultralytics from printing a line per inference call
+os.environ.setdefault("YOLO_VERBOSE", "False")
+
+from backend import inference_pool, yolov8_detector
+
+IMAGE_DIR = Path(__file__).resolve().parent
+IMAGES = ["dog.jpg", "OIP.jpg"]
+
+def load_frames(long_side: int):
+    """Decode the bundled images and resize so their longest side matches"""
+    frames = []
+    for name in IMAGES:
+        frame = cv2.imread(str(IMAGE_DIR / name))
+        scale = long_side / max(frame.shape[:2])
+        frames.append(cv2.resize(frame, None, fx=scale, fy=scale))
+    return frames
+
+def time_calls(func, repeats: int, warmup: int):
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def summarize(samples, images_per_call: int):
+    ordered = sorted(samples)
+    mean = statistics.fmean(ordered)
+    return {
+        "calls": len(ordered),
+        "images_per_call": images_per_call,
+        "mean_ms": round(mean * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "images_per_second": round(images_per_call / mean, 2),
+    }
+
+def start_pool(loop, workers: int, threads: int):
+    """(Re)start the inference pool with workers processes of threads each"""
+    inference_pool.shutdown()
+    inference_pool.PoolConfig.WORKERS = workers
+    inference_pool.PoolConfig.TORCH_THREADS = threads
+    loop.run_until_complete(inference_pool.warmup())
+    status = inference_pool.get_status()
+    if status["status"] != "ready":
+        raise SystemExit(f"Inference pool failed to start: {status['error']}")
+
+def run_benchmarks(sizes, batch_sizes, thread_counts, profile, repeats, warmup, pool_workers):
+    import torch
+
+    results = []
+    loop = asyncio.new_event_loop()
+    for threads in thread_counts:
+        torch.set_num_threads(threads)
+        for size in sizes:
+            frames = load_frames(size)
+            encoded = [
+                base64.b64encode(cv2.imencode(".jpg", frame)[1]).decode("utf-8")
+                for frame in frames
+            ]
+
+            # The original single-image base64 entry point
+            samples = time_calls(
+                lambda: yolov8_detector.detect_objects_from_base64(encoded[0]),
+                repeats, warmup
+            )
+            results.append({"api": "detect_objects_from_base64", "threads": threads,
+                             "input_size": size, "batch_size": 1, "profile": "default",
+                             **summarize(samples, 1)})
+
+            # The batch API on already decoded frames
+            for batch_size in batch_sizes:
+                batch = [frames[i % len(frames)] for i in range(batch_size)]
+                samples = time_calls(
+                    lambda: yolov8_detector.detect_objects_batch(batch, profile),
+                    repeats, warmup
+                )
+                results.append({"api": "detect_objects_batch", "threads": threads,
+                                "input_size": size, "batch_size": batch_size, "profile": profile,
+                                **summarize(samples, batch_size)})
+
+            print(f"threads={threads} size={size} done")
+
+        # The production path: frames handed to pool workers through shared
+        # memory, each worker using this many torch threads
+        for workers in pool_workers:
+            start_pool(loop, workers, threads)
+            for size in sizes:
+                frames = load_frames(size)
+                for batch_size in batch_sizes:
+                    batch = [frames[i % len(frames)] for i in range(batch_size)]
+                    samples = time_calls(
+                        lambda: loop.run_until_complete(inference_pool._run_detection(batch, profile)),
+                        repeats, warmup
+                    )
+                    results.append({"api": f"inference_pool[{workers}]", "threads": threads,
+                                    "input_size": size, "batch_size": batch_size, "profile": profile,
+                                    **summarize(samples, batch_size)})
+            print(f"threads={threads} pool workers={workers} done")
+
+    inference_pool.shutdown()
+    loop.close()
+    return results
+
+def case_key(result):
+    return (result["api"], result["threads"], result["input_size"],
+            result["batch_size"], result["profile"])
+
+def compare(current, baseline_path):
+    """Print the images/s change of every case also present in the baseline"""
+    baseline = {case_key(r): r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    print(f"{'api':28} {'thr':>3} {'size':>5} {'batch':>5}  {'base img/s':>10} {'now img/s':>10} {'change':>8}")
+    for result in current:
+        before = baseline.get(case_key(result))
+        if not before:
+            continue
+        change = result["images_per_second"] / before["images_per_second"] - 1
+        print(f"{result['api']:28} {result['threads']:>3} {result['input_size']:>5} "
+              f"{result['batch_size']:>5}  {before['images_per_second']:>10} "
+              f"{result['images_per_second']:>10} {change:>+8.1%}")
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=IMAGE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[320, 640, 960],
+                        help="longest side the test images are resized to")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--threads", type=int, nargs="+",
+                        default=sorted({1, max(1, (os.cpu_count() or 1) // 2), os.cpu_count() or 1}))
+    parser.add_argument("--profile", default="default", help="inference profile for the batch API")
+    parser.add_argument("--pool-workers", type=int, nargs="*", default=[1],
+                        help="inference pool sizes to time (none to skip the pool cases)")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--output", default="detector_benchmark.json")
+    parser.add_argument("--compare", help="earlier JSON output to compare against")
+    args = parser.parse_args()
+
+    yolov8_detector.warmup()
+    status = yolov8_detector.get_status()
+    if status["status"] != "ready":
+        raise SystemExit(f"Detector failed to load: {status['error']}")
+
+    results = run_benchmarks(args.sizes, args.batch_sizes, args.threads,
+                             args.profile, args.repeats, args.warmup, args.pool_workers)
+
+    import torch
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "commit": git_commit(),
+        "model": yolov8_detector.MODEL_NAME,
+        "backend": yolov8_detector.BACKEND.name,
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+        },
+        "settings": vars(args),
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import zlib
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, NamedTuple, Union
+
+class TranscriptSection(NamedTuple):
+    start: float  # start of the first segment
+    end: float  # end of the last segment
+    text: str
+    segments: range  # indexes of the segments it covers
+
+    @property
+    def midpoint(self) -> float:
+        return self.start + (self.end - self.start) / 2
+
+class TranscriptIndex:
+    """A transcript's segments, indexed for time-window lookups.
+
+    Stored compactly: start times and durations as float arrays, and all
+    text as one UTF-8 buffer with each segment's byte offset into it.
+    Start times are sorted so the segments of any window are found by
+    bisection, and a window's text is a single slice of the buffer.
+    """
+
+    SEPARATOR = b" "
+    _HEADER = struct.Struct("<I")
+
+    def __init__(self, segments: List[Dict]):
+        segments = sorted(segments, key=lambda s: s['start'])
+        self.starts = array('d', (float(s['start']) for s in segments))
+        self.durations = array('d', (float(s.get('duration', 0)) for s in segments))
+        texts = [s['text'].encode('utf-8') for s in segments]
+        self._text = self.SEPARATOR.join(texts)
+        # offsets[i] is where segment i starts in the text buffer
+        self._offsets = array('I', [0])
+        for text in texts:
+            self._offsets.append(self._offsets[-1] + len(text) + len(self.SEPARATOR))
+
+    @classmethod
+    def from_transcript(cls, transcript: Union[List[Dict], str, "TranscriptIndex"]) -> "TranscriptIndex":
+        """Accept the API's segment list, or plain text (the manual fallback)"""
+        if isinstance(transcript, cls):
+            return transcript
+        if isinstance(transcript, str):
+            return cls([{'text': transcript, 'start': 0.0, 'duration': 0.0}] if transcript else [])
+        return cls(transcript)
+
+    def to_bytes(self) -> bytes:
+        """zlib-compressed binary form, for caches"""
+        return zlib.compress(
+            self._HEADER.pack(len(self)) + self.starts.tobytes() + self.durations.tobytes()
+            + self._offsets.tobytes() + self._text
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TranscriptIndex":
+        data = zlib.decompress(data)
+        count, = cls._HEADER.unpack_from(data)
+        index = cls([])
+        position = cls._HEADER.size
+        for name, typecode, length in (("starts", 'd', count), ("durations", 'd', count),
+                                       ("_offsets", 'I', count + 1)):
+            values = array(typecode)
+            values.frombytes(data[position:position + length * values.itemsize])
+            setattr(index, name, values)
+            position += length * values.itemsize
+        index._text = data[position:]
+        return index
+
+    def to_segments(self) -> List[Dict]:
+        """The API's list-of-dicts form"""
+        return [
+            {'text': self.text(range(i, i + 1)), 'start': self.starts[i], 'duration': self.durations[i]}
+            for i in range(len(self))
+        ]
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def duration(self) -> float:
+        return self.starts[-1] + self.durations[-1] if len(self) else 0.0
+
+    def window(self, start_time: float, end_time: float, inclusive: bool = False) -> range:
+        """Indexes of the segments starting in [start_time, end_time)
+        (or [start_time, end_time] when inclusive)"""
+        lo = bisect_left(self.starts, start_time)
+        hi = (bisect_right if inclusive else bisect_left)(self.starts, end_time)
+        return range(lo, max(lo, hi))
+
+    def text(self, segments: range = None) -> str:
+        """Joined text of a contiguous run of segments (default: all)"""
+        if segments is None:
+            segments = range(len(self))
+        if not segments:
+            return ""
+        start = self._offsets[segments.start]
+        end = self._offsets[segments.stop] - len(self.SEPARATOR)
+        return self._text[start:end].decode('utf-8')
+
+    def section(self, segments: range) -> TranscriptSection:
+        return TranscriptSection(
+            self.starts[segments.start],
+            self.starts[segments.stop - 1] + self.durations[segments.stop - 1],
+            self.text(segments),
+            segments
+        )
+
+    def sections_by_time(self, count: int) -> List[TranscriptSection]:
+        """Split the timeline into count equal windows; empty ones are skipped.
+        Section bounds are the window's, not its segments'."""
+        length = self.duration / count if count else 0
+        sections = []
+        for i in range(count):
+            start_time, end_time = i * length, (i + 1) * length
+            segments = self.window(start_time, end_time, inclusive=(i == count - 1))
+            text = self.text(segments)
+            if text:
+                sections.append(TranscriptSection(start_time, end_time, text, segments))
+        return sections
+
+    def sections_by_count(self, count: int) -> List[TranscriptSection]:
+        """Split into count runs with (nearly) equal numbers of segments"""
+        total = len(self)
+        sections = []
+        for i in range(count):
+            segments = range(i * total // count, (i + 1) * total // count)
+            if segments:
+                sections.append(self.section(segments))
+        return sections
@@ -0,0 +1,84 @@
+import re
+from typing import List
+import numpy as np
+
+from .transcript_index import TranscriptIndex
+
+# Caption lines that carry no content: sound cues, music notes, channel plugs
+BOILERPLATE = re.compile(
+    r"^\W*$|^\s*[\[(][^\])]*[\])]\s*$|subscribe|like and share|hit the bell",
+    re.IGNORECASE
+)
+WORD = re.compile(r"[a-z0-9']+")
+STOPWORDS = frozenset("""
+a an and are as at be but by can do for from has have he her his i if in is it its
+just let's me my no not now of oh ok okay on or our really right she so that the their
+them then there these they this to uh um up us very was we well what when where which
+who will with yeah you your
+""".split())
+
+# Rough chars-per-token ratio for English prompt text
+CHARS_PER_TOKEN = 4
+
+class TranscriptRanker:
+    """Scores a transcript's segments by how much content they carry.
+
+    Each segment is scored by its TF-IDF mass (IDF taken over the
+    transcript's own segments) divided by its word count, so segments full
+    of rare, topic-specific words rank above filler. Boilerplate lines
+    score zero. All segments are scored at once when the ranker is built.
+    """
+
+    def __init__(self, index: TranscriptIndex):
+        self.index = index
+        self.scores = self._score(self.index)
+
+    @staticmethod
+    def _score(index: TranscriptIndex) -> np.ndarray:
+        count = len(index)
+        vocabulary = {}
+        doc_ids, term_ids = [], []
+        word_counts = np.zeros(count)
+        for i in range(count):
+            text = index.text(range(i, i + 1))
+            if BOILERPLATE.search(text):
+                continue
+            words = WORD.findall(text.lower())
+            word_counts[i] = len(words)
+            for word in words:
+                if word not in STOPWORDS:
+                    doc_ids.append(i)
+                    term_ids.append(vocabulary.setdefault(word, len(vocabulary)))
+
+        if not term_ids:
+            return np.zeros(count)
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+
+        # Document frequency from the distinct (segment, term) pairs
+        pairs = np.unique(doc_ids * len(vocabulary) + term_ids)
+        document_frequency = np.bincount(pairs % len(vocabulary), minlength=len(vocabulary))
+        idf = np.log((1 + count) / (1 + document_frequency)) + 1
+
+        mass = np.bincount(doc_ids, weights=idf[term_ids], minlength=count)
+        return np.divide(mass, word_counts, out=np.zeros(count), where=word_counts > 0)
+
+    def excerpt(self, segments: range, token_budget: int) -> str:
+        """The highest-scoring segments of a run that fit in token_budget,
+        joined in their original order"""
+        budget = token_budget * CHARS_PER_TOKEN
+        candidates = [i for i in segments if self.scores[i] > 0]
+        ranked = sorted(candidates, key=lambda i: -self.scores[i])
+
+        chosen: List[int] = []
+        used = 0
+        for i in ranked:
+            length = len(self.index.text(range(i, i + 1))) + 1
+            if used + length <= budget:
+                chosen.append(i)
+                used += length
+
+        if not chosen and ranked:
+            # A single segment longer than the budget (e.g. plain-text fallback)
+            return self.index.text(range(ranked[0], ranked[0] + 1))[:budget]
+        return " ".join(self.index.text(range(i, i + 1)) for i in sorted(chosen))
@@ -0,0 +1,75 @@
+import os
+import base64
+import asyncio
+from typing import Awaitable, Callable, Dict, List
+
+from .transcript_index import TranscriptIndex
+from .two_tier_cache import TwoTierCache
+
+class TranscriptCacheConfig:
+    MEMORY_ENTRIES = int(os.getenv("TRANSCRIPT_CACHE_SIZE", 128))
+    REDIS_TTL = int(os.getenv("TRANSCRIPT_CACHE_TTL", 7 * 24 * 3600))
+    REDIS_PREFIX = "transcripts-v2"  # values are base64 TranscriptIndex.to_bytes()
+
+class TranscriptService:
+    """Transcript lookups shared by every caller.
+
+    Checks a TwoTierCache (an in-process LRU, then the shared Redis
+    connection if there is one), and only then calls fetch. Concurrent requests for the same video
+    wait on a single fetch. fetch should raise when no transcript could be
+    retrieved, so failures are never cached.
+
+    Transcripts are held and returned as TranscriptIndex, which is several
+    times smaller than the API's list of dicts, and stored in Redis in its
+    compressed binary form.
+    """
+
+    def __init__(self, fetch: Callable[[str], Awaitable[List[Dict]]],
+                 max_entries: int = TranscriptCacheConfig.MEMORY_ENTRIES):
+        self.fetch = fetch
+        self._cache = TwoTierCache(
+            "Transcript cache", max_entries, TranscriptCacheConfig.REDIS_TTL,
+            encode=lambda transcript: base64.b64encode(transcript.to_bytes()).decode(),
+            decode=lambda value: TranscriptIndex.from_bytes(base64.b64decode(value))
+        )
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.fetches = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(video_id: str) -> str:
+        return f"{TranscriptCacheConfig.REDIS_PREFIX}:{video_id}"
+
+    async def get(self, video_id: str) -> TranscriptIndex:
+        transcript = self._cache.peek(self.make_key(video_id))
+        if transcript is not None:
+            return transcript
+
+        task = self._in_flight.get(video_id)
+        if task is None:
+            task = asyncio.create_task(self._load(video_id))
+            self._in_flight[video_id] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(video_id, None))
+        else:
+            self.coalesced += 1
+        # Shielded so one caller giving up doesn't cancel the others' fetch
+        return await asyncio.shield(task)
+
+    async def _load(self, video_id: str) -> TranscriptIndex:
+        key = self.make_key(video_id)
+        transcript = await asyncio.to_thread(self._cache.get, key)
+        if transcript is not None:
+            return transcript
+
+        self.fetches += 1
+        transcript = TranscriptIndex.from_transcript(await self.fetch(video_id))
+        await asyncio.to_thread(self._cache.set, key, transcript)
+        return transcript
+
+    def stats(self):
+        return {
+            **self._cache.stats(),
+            "fetches": self.fetches,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,120 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from .shared_redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+class TwoTierCache:
+    """An in-process LRU in front of the shared Redis connection.
+
+    Lookups go to the LRU first and then to Redis, if it's configured;
+    Redis hits are promoted into the LRU. Values are held as-is in memory,
+    and encode/decode convert them to and from the strings stored in Redis.
+    Redis errors are logged and treated as misses. None keys (e.g. for
+    inputs that couldn't be hashed) are skipped and never counted.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl: int,
+                 encode: Callable[[Any], str] = None, decode: Callable[[str], Any] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.encode = encode or (lambda value: value)
+        self.decode = decode or (lambda value: value)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Look in the in-process tier only; a miss here isn't counted"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._entries[key]
+        return None
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: List[Optional[str]]) -> List[Optional[Any]]:
+        """Look up several keys; missing entries come back as None"""
+        results = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key is None:
+                    continue
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    results[i] = self._entries[key]
+                    self.memory_hits += 1
+                else:
+                    missing.append(i)
+
+        redis_client = get_redis_client()
+        if missing and redis_client is not None:
+            try:
+                values = redis_client.mget([keys[i] for i in missing])
+                found = []
+                for i, value in zip(missing, values):
+                    if value is not None:
+                        results[i] = self.decode(value)
+                        found.append(i)
+                for i in found:
+                    self.remember(keys[i], results[i])
+                with self._lock:
+                    self.redis_hits += len(found)
+            except Exception as e:
+                logger.warning(f"{self.name} Redis lookup failed: {str(e)}")
+
+        with self._lock:
+            self.misses += sum(1 for i in missing if results[i] is None)
+        return results
+
+    def set(self, key: str, value: Any):
+        self.set_many([(key, value)])
+
+    def set_many(self, items: Iterable[Tuple[str, Any]]):
+        """Store (key, value) pairs in both tiers"""
+        items = list(items)
+        for key, value in items:
+            self.remember(key, value)
+
+        redis_client = get_redis_client()
+        if items and redis_client is not None:
+            try:
+                pipe = redis_client.pipeline()
+                for key, value in items:
+                    pipe.set(key, self.encode(value), ex=self.ttl)
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"{self.name} Redis store failed: {str(e)}")
+
+    def remember(self, key: str, value: Any):
+        """Store in the in-process tier only"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            entries = len(self._entries)
+            memory_hits, redis_hits, misses = self.memory_hits, self.redis_hits, self.misses
+        lookups = memory_hits + redis_hits + misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "memory_hits": memory_hits,
+            "redis_hits": redis_hits,
+            "misses": misses,
+            "hit_rate": round((memory_hits + redis_hits) / lookups, 3) if lookups else 0.0,
+            "redis_enabled": get_redis_client() is not None
+        }
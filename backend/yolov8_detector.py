@@ -1,43 +1,142 @@
-from ultralytics import YOLO
 import cv2
 import base64
+import threading
 import numpy as np
 from PIL import Image
-import io
 from io import BytesIO
 
-model = YOLO("yolov8n.pt", task='detect') # Model
+from .detector_backends import get_backend
+from .detections import Detections
+from .inference_profiles import get_profile
 
-def detect_objects_from_base64(image_base64):
+MODEL_NAME = "yolov8n"
+BACKEND = get_backend(MODEL_NAME)
+# Identifies the weights actually producing results (cache keys, health)
+MODEL_ID = f"{MODEL_NAME}-{BACKEND.name}"
+
+# The model is loaded on first use (or by warmup() at startup) so that
+# importing this module doesn't pull in torch and the weights.
+_model = None
+_model_lock = threading.Lock()
+_state = {"status": "not_loaded", "error": None}
+
+def get_model():
+    """Return the shared YOLO model, loading it from the configured backend
+    on first call"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _state["status"] = "loading"
+                _model = BACKEND.load()
+                _state["status"] = "loaded"
+    return _model
+
+def warmup():
+    """Load the model and run one dummy inference so the first real request
+    doesn't pay the load and JIT cost."""
     try:
-        # Decode base64 to bytes
-        image_bytes = base64.b64decode(image_base64)
-
-        # Convert to PIL Image to ensure proper format
-        img = Image.open(BytesIO(image_bytes)).convert("RGB")
-
-        # Convert to numpy array
-        img_np = np.array(img)
-
-        # Run detection
-        results = model(img_np, stream=True)
-
-        detections = []
-        for result in results:
-            for box in result.boxes:
-                x1, y1, x2, y2 = box.xyxy[0].tolist()
-                label = model.names[int(box.cls[0])]
-                confidence = float(box.conf[0])
-                detections.append({
-                    "label": label,
-                    "box": [int(x1), int(y1), int(x2), int(y2)],
-                    "confidence": round(confidence, 2)
-                })
-        return detections
+        model = get_model()
+        model(np.zeros((320, 320, 3), dtype=np.uint8), verbose=False)
+        _state.update(status="ready", error=None)
+    except Exception as e:
+        _state.update(status="error", error=str(e))
+        print(f"YOLO warmup failed: {str(e)}")
+
+def get_status():
+    """Readiness of the detector: not_loaded, loading, loaded (not warmed
+    up yet), ready or error"""
+    return {
+        "status": _state["status"],
+        "model": MODEL_NAME,
+        "backend": BACKEND.name,
+        "backend_description": BACKEND.description,
+        "error": _state["error"]
+    }
+
+def decode_image(image):
+    """Decode an image into the BGR numpy array the model expects.
+
+    Accepts raw encoded bytes (JPEG/PNG/...), an already decoded numpy array,
+    or a base64 string for older callers. Encoded bytes are decoded straight
+    into a numpy buffer by OpenCV, so the pixels are only touched once.
+    """
+    if isinstance(image, np.ndarray):
+        if image.ndim == 2:
+            return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        return image
+
+    if isinstance(image, str):
+        image = base64.b64decode(image)
+
+    buffer = np.frombuffer(image, dtype=np.uint8)
+    img_np = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+    if img_np is not None:
+        return img_np
+
+    # Formats OpenCV can't read (e.g. GIF) go through PIL instead
+    img = Image.open(BytesIO(image)).convert("RGB")
+    return cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)
+
+def try_detect_batch(images, profile=None):
+    """Run detection on a list of images in a single forward pass.
+
+    profile names one of the inference profiles (input size, confidence
+    floor, max detections, allowed classes); None uses the default.
 
+    Returns a columnar Detections per image. Entries for images that are
+    None, fail to decode or fail inference are None rather than empty, so
+    callers can tell "nothing detected" apart from "not detected".
+    """
+    profile = get_profile(profile)
+    outputs = [None for _ in images]
+    frames = []
+    positions = []
+    for i, image in enumerate(images):
+        if image is None:
+            continue
+        try:
+            frames.append(decode_image(image))
+            positions.append(i)
+        except Exception as e:
+            print(f"Image decode error: {str(e)}")
+
+    if not frames:
+        return outputs
+
+    try:
+        # Run detection on all frames at once
+        model = get_model()
+        results = model(frames, **profile.predict_kwargs(model.names))
+        for position, result in zip(positions, results):
+            outputs[position] = Detections.from_result(result, model.names)
     except Exception as e:
         print(f"Detection error: {str(e)}")
-        return []
+
+    return outputs
+
+def detect_objects_batch(images, profile=None):
+    """Run detection on a list of images in a single forward pass.
+
+    Each image may be raw bytes, a decoded BGR numpy array or a base64
+    string (see decode_image).
+
+    Returns one detection list per input image, in the same order. Images
+    that are None or fail to decode get an empty list instead of failing
+    the batch.
+    """
+    return [
+        detections.to_dicts() if detections is not None else []
+        for detections in try_detect_batch(images, profile)
+    ]
+
+def detect_objects(image, profile=None):
+    """Detect objects in a single image given as bytes or a numpy array"""
+    return detect_objects_batch([image], profile)[0]
+
+def detect_objects_from_base64(image_base64):
+    return detect_objects(image_base64)
+
 
 from fastapi import APIRouter
 
@@ -46,4 +145,3 @@ router = APIRouter()
 @router.get("/yolo-test")
 def yolo_test():
     return {"message": "🧠 YOLOv8 is ready"}
-
@@ -1,26 +1,41 @@
 # yolo_router.py
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
 from fastapi.responses import JSONResponse
-from backend.yolov8_detector import detect_objects_from_base64
-import base64
-from io import BytesIO
+import os
+import json
+from backend import inference_pool
+from backend.detection_cache import detection_cache
+from backend.inference_profiles import PROFILES, DEFAULT_PROFILE
+from backend.multipart_stream import RequestStreamingResponse, get_multipart_boundary, iter_multipart_files
+from backend.yolov8_detector import MODEL_NAME, BACKEND
 
 router = APIRouter(prefix="/yolo", tags=["Object Detection"])
 
+class StreamConfig:
+    BATCH_SIZE = int(os.getenv("YOLO_STREAM_BATCH_SIZE", 8))
+    MAX_FILE_BYTES = int(os.getenv("YOLO_STREAM_MAX_FILE_BYTES", 20 * 1024 * 1024))
+
 @router.post("/detect")
-async def detect_objects(file: UploadFile = File(...)):
+async def detect_objects(file: UploadFile = File(...), profile: str = DEFAULT_PROFILE):
+    if profile not in PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown profile '{profile}', expected one of {sorted(PROFILES)}"
+        )
+
     try:
-        # Read and convert the uploaded file to base64
+        # Hand the raw upload bytes straight to the inference workers
         image_bytes = await file.read()
-        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
 
-        # Detect objects
-        detections = detect_objects_from_base64(image_base64)
+        # Detect objects, batched together with any concurrent requests
+        detections = (await inference_pool.detect_batchers[profile].submit(image_bytes)).to_dicts()
 
         return {
             "detections": detections,
             "count": len(detections),
-            "model": "yolov8n"
+            "model": MODEL_NAME,
+            "backend": BACKEND.name,
+            "profile": profile
         }
 
     except Exception as e:
@@ -29,9 +44,94 @@ async def detect_objects(file: UploadFile = File(...)):
             detail=f"Object detection failed: {str(e)}"
         )
 
+@router.post("/detect/stream")
+async def detect_objects_stream(request: Request, profile: str = DEFAULT_PROFILE):
+    """Detect objects in many uploaded files (multipart, any field name).
+
+    Files are read off the request as they arrive, run through inference in
+    batches of YOLO_STREAM_BATCH_SIZE, and each batch's results are streamed
+    back as NDJSON lines (one per file, in upload order) before the next
+    batch is read, so memory stays bounded regardless of upload size.
+    """
+    if profile not in PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown profile '{profile}', expected one of {sorted(PROFILES)}"
+        )
+
+    # Reject a malformed request before the 200 response starts
+    get_multipart_boundary(request)
+    files = iter_multipart_files(request, StreamConfig.MAX_FILE_BYTES)
+
+    async def detect_file_batch(batch):
+        valid = [f for f in batch if f.error is None]
+        results = await inference_pool.detect_batch(
+            [f.data for f in valid], profile=profile, keep_failures=True
+        )
+        detections = {f.index: d for f, d in zip(valid, results)}
+        lines = []
+        for f in batch:
+            if f.error is None and detections[f.index] is None:
+                # Undecodable files must not look like images with no objects
+                f.error = "could not decode image"
+            if f.error is not None:
+                line = {"index": f.index, "filename": f.filename, "error": f.error}
+            else:
+                found = detections[f.index].to_dicts()
+                line = {
+                    "index": f.index,
+                    "filename": f.filename,
+                    "detections": found,
+                    "count": len(found)
+                }
+            lines.append(json.dumps(line) + "\n")
+        return "".join(lines)
+
+    async def stream_results():
+        batch = []
+        total = 0
+        try:
+            async for uploaded in files:
+                batch.append(uploaded)
+                if len(batch) >= StreamConfig.BATCH_SIZE:
+                    yield await detect_file_batch(batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                yield await detect_file_batch(batch)
+                total += len(batch)
+        except Exception as e:
+            yield json.dumps({"error": f"Object detection failed: {str(e)}"}) + "\n"
+        yield json.dumps({"done": True, "files": total, "model": MODEL_NAME,
+                          "backend": BACKEND.name, "profile": profile}) + "\n"
+
+    return RequestStreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 @router.get("/health")
 def yolo_health_check():
+    # 503 until the startup warmup has finished so load balancers can wait on it
+    status = inference_pool.get_status()
+    return JSONResponse(
+        content=status,
+        status_code=200 if status["status"] == "ready" else 503
+    )
+
+@router.get("/cache/stats")
+def detection_cache_stats():
+    return detection_cache.stats()
+
+@router.get("/batching/stats")
+def detection_batching_stats():
+    return {name: batcher.stats() for name, batcher in inference_pool.detect_batchers.items()}
+
+@router.get("/profiles")
+def list_inference_profiles():
     return {
-        "status": "ready",
-        "model": "yolov8n"
-    }
\ No newline at end of file
+        name: {
+            "imgsz": p.imgsz,
+            "conf": p.conf,
+            "max_det": p.max_det,
+            "classes": list(p.classes) if p.classes is not None else None
+        }
+        for name, p in PROFILES.items()
+    }
@@ -0,0 +1,51 @@
+import asyncio
+from backend.batching import MicroBatcher
+
+
+def test_concurrent_requests_share_a_batch():
+    calls = []
+
+    async def double(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(double, max_batch_size=4, max_wait_ms=50)
+        results = await asyncio.gather(*[batcher.submit(i) for i in range(6)])
+        await batcher.stop()
+        return results, batcher.stats()
+
+    results, stats = asyncio.run(run())
+    assert results == [0, 2, 4, 6, 8, 10]
+    assert [len(c) for c in calls] == [4, 2]
+    assert stats["batch_size_histogram"] == {2: 1, 4: 1}
+    assert stats["items"] == 6
+
+
+def test_batch_failure_reaches_every_caller():
+    async def fail(items):
+        raise RuntimeError("boom")
+
+    async def run():
+        batcher = MicroBatcher(fail, max_batch_size=4, max_wait_ms=10)
+        results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_stop_fails_items_that_were_never_dispatched():
+    async def double(items):
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(double, max_batch_size=4, max_wait_ms=500)
+        waiting = [asyncio.create_task(batcher.submit(i)) for i in range(2)]
+        await asyncio.sleep(0.05)  # collected, but still inside the window
+        await batcher.stop()
+        return await asyncio.wait_for(asyncio.gather(*waiting, return_exceptions=True), timeout=1)
+
+    results = asyncio.run(run())
+    assert [str(r) for r in results] == ["batcher stopped", "batcher stopped"]
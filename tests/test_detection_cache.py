@@ -0,0 +1,30 @@
+import numpy as np
+from backend.detection_cache import DetectionCache
+from backend.detections import Detections
+
+
+def test_same_content_same_key():
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    assert DetectionCache.make_key(frame, "yolov8n") == DetectionCache.make_key(frame.copy(), "yolov8n")
+    assert DetectionCache.make_key(frame, "yolov8n") != DetectionCache.make_key(frame, "yolov8s")
+    assert DetectionCache.make_key(b"abc", "yolov8n") != DetectionCache.make_key(b"abd", "yolov8n")
+
+
+def test_lru_eviction_and_counters():
+    cache = DetectionCache(max_entries=2)
+    first = Detections([[0, 0, 1, 1]], [0.9], [0], ["person"])
+    second = Detections([[1, 1, 2, 2]], [0.8], [16], ["dog"])
+    cache.set_many([("a", first), ("b", first), ("c", second)])
+
+    missing, b, c, skipped = cache.get_many(["a", "b", "c", None])
+    assert missing is None and skipped is None
+    for found, expected in ((b, first), (c, second)):
+        np.testing.assert_array_equal(found.boxes, expected.boxes)
+        np.testing.assert_array_equal(found.class_ids, expected.class_ids)
+        np.testing.assert_array_equal(found.confidences, expected.confidences)
+
+    stats = cache.stats()
+    assert stats["memory_hits"] == 2
+    # The None key (an image that failed to load) isn't a miss
+    assert stats["misses"] == 1
+    assert stats["entries"] == 2
@@ -0,0 +1,38 @@
+import numpy as np
+from backend.detections import Detections
+
+
+def make_detections():
+    return Detections(
+        boxes=[[0, 0, 10, 10], [5, 5, 55, 45], [0, 0, 30, 30], [1, 1, 2, 2]],
+        confidences=[0.9, 0.4, 0.75, 0.2],
+        class_ids=[16, 0, 16, 2],
+        labels=["dog", "person", "dog", "car"],
+    )
+
+
+def test_filter_and_largest():
+    detections = make_detections()
+
+    confident = detections.filter(min_confidence=0.5)
+    assert confident.labels.tolist() == ["dog", "dog"]
+    assert confident.largest().boxes.tolist() == [[0, 0, 30, 30]]
+
+    assert detections.largest().labels.tolist() == ["person"]
+    assert detections.filter(labels=["car", "cat"]).class_ids.tolist() == [2]
+    assert Detections.empty().largest() is None
+
+
+def test_group_by_label():
+    groups = make_detections().group_by_label()
+    assert sorted(groups) == ["car", "dog", "person"]
+    assert np.allclose(groups["dog"].confidences, [0.9, 0.75])
+
+
+def test_dicts_and_columns_round_trip():
+    detections = make_detections()
+    assert detections.to_dicts()[1] == {"label": "person", "box": [5, 5, 55, 45], "confidence": 0.4}
+
+    restored = Detections.from_columns(detections.to_columns())
+    assert restored.to_dicts() == detections.to_dicts()
+    assert len(Detections.empty().to_dicts()) == 0
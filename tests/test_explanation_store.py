@@ -0,0 +1,20 @@
+from backend.explanation_store import ExplanationStore
+
+OPTIONS = ["Dog", "Cat", "Cow"]
+
+
+def test_lookup_normalizes_and_evicts():
+    store = ExplanationStore(max_entries=1)
+    store.set("Which animal barks?", "Cat", "Dog", OPTIONS, "Cats meow!")
+    assert store.get("which animal  barks?", "cat", "dog", ["cow", "dog", "cat"]) == "Cats meow!"
+    assert store.get("Which animal barks?", "Cow", "Dog", OPTIONS) is None
+
+    store.set("Which animal barks?", "Cow", "Dog", OPTIONS, "Cows moo!")
+    assert store.get("Which animal barks?", "Cat", "Dog", OPTIONS) is None
+    assert store.stats()["memory_hits"] == 1
+
+
+def test_options_are_part_of_the_key():
+    store = ExplanationStore()
+    store.set("Which animal barks?", "Cat", "Dog", OPTIONS, "Cats meow!")
+    assert store.get("Which animal barks?", "Cat", "Dog", ["Dog", "Cat", "Fox"]) is None
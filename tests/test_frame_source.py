@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from backend.frame_source import VideoFrameReader, find_local_video
+
+
+def write_video(path, frames=50, fps=10):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (64, 48))
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), i * 4, dtype=np.uint8))
+    writer.release()
+
+
+def test_reads_frames_in_order(tmp_path):
+    write_video(tmp_path / "abc123.mp4")
+    path = find_local_video(str(tmp_path), "abc123")
+    assert path is not None
+    assert find_local_video(str(tmp_path), "missing") is None
+
+    with VideoFrameReader(path) as reader:
+        assert abs(reader.duration - 5.0) < 0.2
+        frames = list(reader.iter_frames([4, 1, 60]))
+
+    # Past-the-end timestamps are skipped, the rest come back sorted
+    assert [t for t, _ in frames] == [1, 4]
+    assert frames[0][1].shape == (48, 64, 3)
+    assert frames[0][1].mean() < frames[1][1].mean()
+
+
+def test_close_waits_for_reads_in_progress(tmp_path):
+    write_video(tmp_path / "abc123.mp4")
+    reader = VideoFrameReader(str(tmp_path / "abc123.mp4"))
+    reader.open()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        reads = [executor.submit(reader.read_at, t) for t in (1, 2, 3, 4)]
+        executor.submit(reader.close).result()
+        # Reads either finished before the release or return nothing
+        results = [read.result() for read in reads]
+
+    assert reader._capture is None
+    assert all(frame is None or frame.shape == (48, 64, 3) for frame in results)
+    # No ffmpeg fallback once closed
+    assert reader.read_at(1) is None
+
+
+def test_samples_every_interval(tmp_path):
+    write_video(tmp_path / "abc123.mp4")
+    with VideoFrameReader(str(tmp_path / "abc123.mp4")) as reader:
+        timestamps, frames = reader.sample_frames(1.0, size=(16, 12))
+
+    assert list(timestamps) == [0, 1, 2, 3, 4]
+    assert frames.shape == (5, 12, 16)
+    # The synthetic video brightens over time
+    assert np.all(np.diff(frames.mean(axis=(1, 2))) > 0)
@@ -0,0 +1,85 @@
+import os
+import json
+import asyncio
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+from backend import gpt_helper
+from backend.llm_cache import LLMCache
+
+SECTIONS = [(0, 30, "cats purr"), (30, 60, "dogs bark"), (60, 95, "birds sing")]
+
+
+def question(section, answer="A"):
+    return {"section": section, "text": "Q?", "options": ["A", "B", "C", "D"], "answer": answer}
+
+
+def test_parse_keeps_only_valid_expected_sections():
+    content = "```json\n" + json.dumps([
+        question(1),
+        question(2, answer="Z"),  # answer not among the options
+        question(7),  # section that wasn't asked for
+        {"section": 3, "text": "Q?"},
+    ]) + "\n```"
+    parsed = gpt_helper.parse_sections_response(content, {1: None, 2: None, 3: None})
+    assert list(parsed) == [1]
+    assert "section" not in parsed[1]
+
+
+def test_batched_generation_re_requests_missing_sections(monkeypatch, tmp_path):
+    replies = [[question(1), question(3, answer="nope")], [question(2), question(3)]]
+    prompts = []
+
+    async def create(**kwargs):
+        prompts.append(kwargs["messages"][0]["content"])
+        content = json.dumps(replies[len(prompts) - 1])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    fake_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(gpt_helper, "async_client", fake_client)
+    monkeypatch.setattr(gpt_helper, "llm_cache", LLMCache(str(tmp_path / "llm.sqlite3")))
+
+    results = asyncio.run(gpt_helper.agenerate_questions_for_sections("Pets", SECTIONS))
+    assert [r["answer"] for r in results] == ["A", "A", "A"]
+    assert len(prompts) == 2
+    assert "Section 1 (0:00–0:30)" in prompts[0]
+    # The retry only asks for what was missing
+    assert "Section 1 " not in prompts[1]
+    assert "Section 2 (0:30–1:00)" in prompts[1] and "Section 3 (1:00–1:35)" in prompts[1]
+
+    # The partial first batch wasn't cached, so asking again makes a new request
+    replies.append([question(1), question(2), question(3)])
+    asyncio.run(gpt_helper.agenerate_questions_for_sections("Pets", SECTIONS))
+    assert len(prompts) == 3
+    # ...but that complete batch was, so a third ask is served from the cache
+    asyncio.run(gpt_helper.agenerate_questions_for_sections("Pets", SECTIONS))
+    assert len(prompts) == 3
+
+
+def test_background_explanations_leave_foreground_slots_free(monkeypatch, tmp_path):
+    async def run():
+        release = asyncio.Event()
+
+        async def create(**kwargs):
+            if "Cow" in kwargs["messages"][0]["content"]:
+                await release.wait()
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=" Nice try! "))])
+
+        fake_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        monkeypatch.setattr(gpt_helper, "async_client", fake_client)
+        monkeypatch.setattr(gpt_helper, "openai_limit", asyncio.Semaphore(1))
+        monkeypatch.setattr(gpt_helper, "openai_background_limit", asyncio.Semaphore(1))
+
+        background = asyncio.create_task(gpt_helper.agenerate_explanation(
+            "Which animal barks?", "Cow", "Dog", ["Dog", "Cow"], use_cache=False, background=True
+        ))
+        await asyncio.sleep(0)
+        # The stalled background call doesn't hold the only foreground slot
+        foreground = await asyncio.wait_for(gpt_helper.agenerate_explanation(
+            "Which animal barks?", "Cat", "Dog", ["Dog", "Cat"], use_cache=False
+        ), timeout=1)
+        release.set()
+        return foreground, await background
+
+    monkeypatch.setattr(gpt_helper, "llm_cache", LLMCache(str(tmp_path / "llm.sqlite3")))
+    assert asyncio.run(run()) == ("Nice try!", "Nice try!")
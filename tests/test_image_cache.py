@@ -0,0 +1,82 @@
+import asyncio
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from backend import http_client
+from backend.image_cache import ImageCache, ImageCacheConfig
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve(directory):
+    handler = functools.partial(QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_revalidation_negative_caching_and_eviction(tmp_path, monkeypatch):
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "a.jpg").write_bytes(b"a" * 100)
+    (site / "b.jpg").write_bytes(b"b" * 100)
+    server = serve(site)
+    base = f"http://127.0.0.1:{server.server_port}"
+    cache = ImageCache(str(tmp_path / "cache"), max_bytes=150)
+
+    async def run():
+        try:
+            # Fetched once, then served from disk
+            assert await cache.fetch(f"{base}/a.jpg") == b"a" * 100
+            assert await cache.fetch(f"{base}/a.jpg") == b"a" * 100
+            assert (cache.misses, cache.hits) == (1, 1)
+
+            # 404s are remembered
+            assert await cache.fetch(f"{base}/missing.jpg") is None
+            assert await cache.fetch(f"{base}/missing.jpg") is None
+            assert cache.negative_hits == 1
+
+            # Stale entries are revalidated with If-Modified-Since
+            monkeypatch.setattr(ImageCacheConfig, "DEFAULT_MAX_AGE", 0)
+            assert await cache.fetch(f"{base}/b.jpg") == b"b" * 100
+            assert await cache.fetch(f"{base}/b.jpg") == b"b" * 100
+            assert await cache.fetch(f"{base}/b.jpg") == b"b" * 100
+            assert cache.revalidated == 2
+
+            # The size cap evicted the older entries, 404 included; the
+            # byte count covers metadata files as well as bodies
+            assert cache.stats()["entries"] == 1
+            on_disk = sum(path.stat().st_size for path in (tmp_path / "cache").iterdir())
+            assert cache.stats()["bytes"] == on_disk > 100
+        finally:
+            await http_client.close()
+            server.shutdown()
+
+    asyncio.run(run())
+
+
+def test_remembered_404s_count_toward_the_size_cap(tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    server = serve(site)
+    base = f"http://127.0.0.1:{server.server_port}"
+    cache = ImageCache(str(tmp_path / "cache"), max_bytes=1000)
+
+    async def run():
+        try:
+            for i in range(40):
+                assert await cache.fetch(f"{base}/{i}.jpg") is None
+        finally:
+            await http_client.close()
+            server.shutdown()
+
+    asyncio.run(run())
+    files = list((tmp_path / "cache").iterdir())
+    assert 0 < len(files) < 20
+    assert sum(path.stat().st_size for path in files) <= 1000
+    # The most recent 404 is still remembered
+    assert cache._load(cache.make_key(f"{base}/39.jpg"))[0]["status"] == 404
@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+import numpy as np
+from multiprocessing import shared_memory
+
+ultralytics = pytest.importorskip("ultralytics")
+
+from backend import inference_pool
+from backend.detections import Detections
+
+
+@pytest.fixture
+def worker_pool(tmp_path, monkeypatch):
+    # Untrained weights built from the bundled config; the workers pick the
+    # directory up from the environment when they import the detector
+    ultralytics.YOLO("yolov8n.yaml").save(str(tmp_path / "yolov8n.pt"))
+    monkeypatch.setenv("DETECTOR_MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(inference_pool.PoolConfig, "WORKERS", 1)
+    monkeypatch.setattr(inference_pool.PoolConfig, "TORCH_THREADS", 1)
+    yield
+    inference_pool.shutdown()
+
+
+def test_detection_in_worker_process_releases_shared_memory(worker_pool, monkeypatch):
+    shared = []
+
+    def tracking_to_shared(image):
+        block, spec = to_shared(image)
+        shared.append(block.name)
+        return block, spec
+
+    to_shared = inference_pool._to_shared
+    monkeypatch.setattr(inference_pool, "_to_shared", tracking_to_shared)
+
+    frames = [np.zeros((64, 64, 3), dtype=np.uint8), np.full((48, 80, 3), 127, dtype=np.uint8)]
+    results = asyncio.run(inference_pool._run_detection(frames, "default"))
+
+    assert [type(r) for r in results] == [Detections, Detections]
+    assert len(shared) == 2
+    for name in shared:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
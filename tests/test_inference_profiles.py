@@ -0,0 +1,32 @@
+from backend.inference_profiles import InferenceProfile, load_product_classes
+
+# A slice of the COCO label map
+NAMES = {0: "person", 2: "car", 4: "airplane", 14: "bird", 16: "dog", 33: "kite", 64: "mouse"}
+
+
+def test_product_classes_map_to_coco(tmp_path):
+    classes_file = tmp_path / "classes.txt"
+    classes_file.write_text("Dog\nPlane\nOwl\nMouse\nKite\nRabbit,Bunny\n", encoding="utf-8")
+    classes = load_product_classes(classes_file)
+
+    assert {"dog", "airplane", "bird", "rabbit", "bunny", "person"} <= set(classes)
+    # COCO's mouse and kite are a computer mouse and a toy kite
+    assert "mouse" not in classes
+    assert "kite" not in classes
+
+
+def test_class_ids_resolve_per_label_map(tmp_path):
+    profile = InferenceProfile("test", classes=("dog", "person", "airplane"))
+    assert profile.class_ids(NAMES) == [0, 4, 16]
+    assert profile.predict_kwargs(NAMES)["classes"] == [0, 4, 16]
+
+    # An equal map built separately shares the entry; a different one doesn't
+    assert profile.class_ids(dict(NAMES)) == [0, 4, 16]
+    assert len(profile._class_ids) == 1
+    assert profile.class_ids({0: "dog", 1: "person"}) == [0, 1]
+
+
+def test_unmatched_classes_fall_back_to_all():
+    profile = InferenceProfile("test", classes=("dinosaur",))
+    assert profile.class_ids(NAMES) is None
+    assert "classes" not in InferenceProfile("all").predict_kwargs(NAMES)
@@ -0,0 +1,36 @@
+import numpy as np
+from backend.keyframe_selector import gray_histograms, scene_change_scores, select_keyframes
+
+
+def make_scenes(levels, frames_per_scene=10):
+    frames = np.concatenate([
+        np.full((frames_per_scene, 8, 8), level, dtype=np.uint8) for level in levels
+    ])
+    return np.arange(len(frames), dtype=float), frames
+
+
+def test_histograms_sum_to_one():
+    _, frames = make_scenes([0, 255], frames_per_scene=2)
+    histograms = gray_histograms(frames)
+    assert histograms.shape == (4, 32)
+    assert np.allclose(histograms.sum(axis=1), 1)
+
+
+def test_scores_peak_at_cuts():
+    _, frames = make_scenes([0, 200, 100])
+    scores = scene_change_scores(frames)
+    assert scores[0] == 0
+    assert set(np.flatnonzero(scores > 0)) == {10, 20}
+
+
+def test_select_ranks_by_novelty_and_spacing():
+    timestamps, frames = make_scenes([0, 250, 200, 40])
+    # Cuts at 10 (big), 20 (small) and 30 (big)
+    assert select_keyframes(timestamps, frames, 5, threshold=0.1, min_spacing=5) == [10.0, 30.0, 20.0]
+    assert select_keyframes(timestamps, frames, 5, threshold=0.1, min_spacing=15) == [10.0, 30.0]
+    assert select_keyframes(timestamps, frames, 1, threshold=0.1, min_spacing=5) == [10.0]
+
+
+def test_static_video_has_no_keyframes():
+    timestamps, frames = make_scenes([90])
+    assert select_keyframes(timestamps, frames, 5) == []
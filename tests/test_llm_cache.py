@@ -0,0 +1,22 @@
+from backend.llm_cache import LLMCache, LLMCacheConfig
+
+
+def test_key_ignores_whitespace_but_not_settings():
+    key = LLMCache.make_key("gpt-4o", 0.5, "Explain  this\n please")
+    assert key == LLMCache.make_key("gpt-4o", 0.5, " Explain this\n   please ")
+    assert key != LLMCache.make_key("gpt-4o", 0.7, "Explain this please")
+    assert key != LLMCache.make_key("gpt-4o-mini", 0.5, "Explain this please")
+
+
+def test_sqlite_ttl_and_size_eviction(tmp_path, monkeypatch):
+    cache = LLMCache(str(tmp_path / "llm.sqlite3"), max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # "a" is now the most recently read
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+
+    monkeypatch.setattr(LLMCacheConfig, "TTL", -1)
+    assert cache.get("a") is None
+    assert cache.stats()["backend"] == "sqlite"
@@ -0,0 +1,68 @@
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend import inference_pool, yolov8_router
+from backend.detections import Detections
+
+
+@pytest.fixture
+def client(monkeypatch):
+    batches = []
+
+    async def detect_batch(images, profile=None, keep_failures=False):
+        batches.append(len(images))
+        # Anything that isn't a "valid image" fails to decode
+        return [
+            Detections([[0, 0, 4, 4]], [0.9], [16], ["dog"]) if image.startswith(b"IMG")
+            else (None if keep_failures else Detections.empty())
+            for image in images
+        ]
+
+    monkeypatch.setattr(inference_pool, "detect_batch", detect_batch)
+    monkeypatch.setattr(yolov8_router.StreamConfig, "BATCH_SIZE", 2)
+    monkeypatch.setattr(yolov8_router.StreamConfig, "MAX_FILE_BYTES", 16)
+    app = FastAPI()
+    app.include_router(yolov8_router.router)
+    test_client = TestClient(app)
+    test_client.batches = batches
+    return test_client
+
+
+def post_stream(client, files, data=None):
+    response = client.post("/yolo/detect/stream", files=files, data=data)
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_streams_every_file_in_upload_order_across_batches(client):
+    files = [("images", (f"{i}.jpg", b"IMG%d" % i)) for i in range(5)]
+    lines = post_stream(client, files, data={"note": "not a file"})
+
+    # The form field is skipped; five files run as batches of 2, 2 and 1
+    assert client.batches == [2, 2, 1]
+    assert [line["index"] for line in lines[:-1]] == [0, 1, 2, 3, 4]
+    assert [line["filename"] for line in lines[:-1]] == ["0.jpg", "1.jpg", "2.jpg", "3.jpg", "4.jpg"]
+    assert all(line["count"] == 1 and line["detections"][0]["label"] == "dog" for line in lines[:-1])
+    assert lines[-1]["done"] is True and lines[-1]["files"] == 5
+
+
+def test_oversized_and_undecodable_files_are_reported_as_errors(client):
+    files = [
+        ("images", ("big.jpg", b"IMG" + b"x" * 32)),
+        ("images", ("c.txt", b"not an image")),
+        ("images", ("ok.jpg", b"IMG")),
+    ]
+    lines = post_stream(client, files)
+
+    assert lines[0] == {"index": 0, "filename": "big.jpg", "error": "File exceeds 16 bytes"}
+    assert lines[1] == {"index": 1, "filename": "c.txt", "error": "could not decode image"}
+    assert lines[2]["count"] == 1
+    # The oversized file never reaches inference
+    assert client.batches == [1, 1]
+
+
+def test_non_multipart_body_is_rejected(client):
+    response = client.post("/yolo/detect/stream", content=b"{}", headers={"content-type": "application/json"})
+    assert response.status_code == 400
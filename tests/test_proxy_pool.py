@@ -0,0 +1,37 @@
+from backend.proxy_pool import ProxyPool, ProxyPoolConfig
+
+
+def test_prefers_fast_healthy_proxies():
+    pool = ProxyPool(["http://a", "http://b"])
+    pool.record_success("http://a", 2.0)
+    pool.record_success("http://b", 0.5)
+    assert pool.choose() == "http://b"
+
+    pool.record_failure("http://b")
+    pool.record_failure("http://b")
+    # 0.5s with a ~51% error rate still beats a clean 2s
+    assert pool.choose() == "http://b"
+    pool.record_success("http://a", 0.4)
+    assert pool.choose() == "http://a"
+
+
+def test_circuit_opens_and_half_opens(monkeypatch):
+    monkeypatch.setattr(ProxyPoolConfig, "FAILURE_THRESHOLD", 2)
+    pool = ProxyPool(["http://a"])
+    pool.record_failure("http://a")
+    assert pool.choose() == "http://a"
+    pool.record_failure("http://a")
+    assert pool.choose() is None
+    assert not pool.available()
+    assert pool.stats()[0]["state"] == "open"
+
+    # After the wait, exactly one trial request gets through
+    monkeypatch.setattr(ProxyPoolConfig, "OPEN_SECONDS", 0)
+    assert pool.choose() == "http://a"
+    assert pool.stats()[0]["state"] == "half_open"
+    pool.record_failure("http://a")
+    assert pool.stats()[0]["state"] == "open"
+
+    assert pool.choose() == "http://a"
+    pool.record_success("http://a", 0.1)
+    assert pool.stats()[0]["state"] == "closed"
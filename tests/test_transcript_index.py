@@ -0,0 +1,44 @@
+from backend.transcript_index import TranscriptIndex
+
+SEGMENTS = [
+    {"text": "gamma", "start": 20.0, "duration": 5.0},
+    {"text": "alpha", "start": 0.0, "duration": 5.0},
+    {"text": "beta", "start": 10.0, "duration": 5.0},
+    {"text": "delta", "start": 30.0, "duration": 10.0},
+]
+
+
+def test_window_lookups_and_text_slices():
+    index = TranscriptIndex(SEGMENTS)
+    assert index.duration == 40.0
+    assert index.text() == "alpha beta gamma delta"
+    assert list(index.window(5, 25)) == [1, 2]
+    assert index.text(index.window(5, 25)) == "beta gamma"
+    assert index.text(index.window(0, 30, inclusive=True)) == "alpha beta gamma delta"
+    assert index.text(index.window(41, 50)) == ""
+
+
+def test_sections():
+    index = TranscriptIndex(SEGMENTS)
+    by_time = index.sections_by_time(2)
+    assert [s.text for s in by_time] == ["alpha beta", "gamma delta"]
+    assert by_time[1].midpoint == 30.0
+
+    by_count = index.sections_by_count(3)
+    assert [s.text for s in by_count] == ["alpha", "beta", "gamma delta"]
+    assert (by_count[2].start, by_count[2].end) == (20.0, 40.0)
+
+
+def test_plain_text_fallback():
+    index = TranscriptIndex.from_transcript("Welcome to the wild!")
+    assert index.sections_by_count(3)[0].text == "Welcome to the wild!"
+    assert len(TranscriptIndex.from_transcript("")) == 0
+
+
+def test_binary_round_trip():
+    segments = [{"text": "héllo wörld", "start": 1.5, "duration": 2.0},
+                {"text": "[Music]", "start": 4.0, "duration": 1.25}]
+    index = TranscriptIndex.from_bytes(TranscriptIndex(segments).to_bytes())
+    assert index.to_segments() == segments
+    assert index.text(index.window(0, 3)) == "héllo wörld"
+    assert len(TranscriptIndex.from_bytes(TranscriptIndex([]).to_bytes())) == 0
@@ -0,0 +1,33 @@
+from backend.transcript_index import TranscriptIndex
+from backend.transcript_ranking import TranscriptRanker
+
+SEGMENTS = [
+    {"text": "[Music]", "start": 0.0, "duration": 2.0},
+    {"text": "so um yeah okay", "start": 2.0, "duration": 2.0},
+    {"text": "caterpillars spin a chrysalis before becoming butterflies", "start": 4.0, "duration": 4.0},
+    {"text": "and then you know it is", "start": 8.0, "duration": 2.0},
+    {"text": "butterflies taste flowers with their feet", "start": 10.0, "duration": 3.0},
+    {"text": "don't forget to subscribe", "start": 13.0, "duration": 2.0},
+]
+
+
+def test_boilerplate_and_filler_rank_lowest():
+    ranker = TranscriptRanker(TranscriptIndex(SEGMENTS))
+    assert ranker.scores[0] == 0
+    assert ranker.scores[5] == 0
+    assert ranker.scores[2] > ranker.scores[3] > 0
+
+
+def test_excerpt_keeps_order_within_budget():
+    index = TranscriptIndex(SEGMENTS)
+    ranker = TranscriptRanker(index)
+    excerpt = ranker.excerpt(range(len(index)), token_budget=30)
+    assert excerpt == ("caterpillars spin a chrysalis before becoming butterflies "
+                       "butterflies taste flowers with their feet")
+    assert len(ranker.excerpt(range(len(index)), token_budget=12)) <= 48
+    assert ranker.excerpt(range(0, 1), token_budget=30) == ""
+
+
+def test_long_plain_text_is_truncated():
+    index = TranscriptIndex.from_transcript("Welcome to the wild! " * 100)
+    assert len(TranscriptRanker(index).excerpt(range(1), token_budget=10)) == 40
@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+from backend.transcript_service import TranscriptService
+
+
+def test_concurrent_requests_share_one_fetch():
+    calls = []
+
+    async def fetch(video_id):
+        calls.append(video_id)
+        await asyncio.sleep(0.01)
+        return [{"text": video_id, "start": 0.0, "duration": 1.0}]
+
+    async def run():
+        service = TranscriptService(fetch, max_entries=1)
+        results = await asyncio.gather(*[service.get("a") for _ in range(5)])
+        assert all(result == results[0] for result in results)
+        await service.get("a")
+        await service.get("b")
+        await service.get("a")  # evicted by "b"
+        return service.stats()
+
+    stats = asyncio.run(run())
+    assert calls == ["a", "b", "a"]
+    assert stats["coalesced"] == 4
+    assert stats["memory_hits"] == 1
+
+
+def test_failures_are_not_cached():
+    attempts = []
+
+    async def fetch(video_id):
+        attempts.append(video_id)
+        raise RuntimeError("unavailable")
+
+    async def run():
+        service = TranscriptService(fetch)
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await service.get("a")
+
+    asyncio.run(run())
+    assert len(attempts) == 2
@@ -0,0 +1,52 @@
+import pytest
+from backend.shared_redis import set_redis_client
+from backend.two_tier_cache import TwoTierCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.fail = False
+
+    def mget(self, keys):
+        if self.fail:
+            raise ConnectionError("down")
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self):
+        return self
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def execute(self):
+        pass
+
+
+@pytest.fixture
+def redis():
+    client = FakeRedis()
+    set_redis_client(client)
+    yield client
+    set_redis_client(None)
+
+
+def test_redis_hits_are_decoded_and_promoted(redis):
+    cache = TwoTierCache("Test cache", max_entries=1, ttl=60, encode=str, decode=int)
+    cache.set_many([("a", 1), ("b", 2)])
+    assert redis.data == {"a": "1", "b": "2"}
+
+    # "a" was evicted from memory by "b" but comes back from Redis
+    assert cache.get_many(["a", "b", "c", None]) == [1, 2, None, None]
+    assert cache.peek("a") == 1
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["redis_hits"], stats["misses"]) == (2, 1, 1)
+    assert stats["redis_enabled"] is True
+
+
+def test_redis_errors_count_as_misses(redis):
+    cache = TwoTierCache("Test cache", max_entries=4, ttl=60)
+    redis.data["a"] = "cached"
+    redis.fail = True
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1